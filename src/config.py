@@ -1,11 +1,40 @@
 """Configuration management for AI Repo Manager."""
 
 import json
+import os
 from pathlib import Path
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+from enum import IntFlag
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-@dataclass
+try:
+    import keyring
+except ImportError:
+    keyring = None
+
+# Keyring service name under which API keys are stored
+KEYRING_SERVICE = "ai-repo-manager"
+
+
+def _dumps(obj) -> bytes:
+    """Encode settings as indented JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _loads(data: bytes):
+    """Decode JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+@dataclass(slots=True)
 class Config:
     """Application configuration."""
 
@@ -60,201 +89,294 @@ class Config:
             self.data_dir = Path(self.data_dir)
 
 
+# Fields written to settings.json (app paths are derived, not persisted),
+# mapped to the type a loaded value must have to be accepted
+_PERSISTED_TYPES = {
+    f.name: f.type for f in fields(Config) if f.name not in ("config_dir", "data_dir")
+}
+
+# UI state that changes often; kept in state.json so that saving it does
+# not rewrite settings.json (older settings.json files may still hold it)
+_STATE_FIELDS = ("window_geometry",)
+_SETTINGS_FIELDS = tuple(name for name in _PERSISTED_TYPES if name not in _STATE_FIELDS)
+
+# API keys, kept in the system keyring when one is available
+_SECRET_FIELDS = ("github_pat", "openrouter_key", "hf_token")
+
+# Path fields that make up each multi-path source
+GITHUB_PATH_FIELDS = ("repos_base_path", "github_public_path", "github_private_path")
+HF_PATH_FIELDS = (
+    "hf_datasets_path", "hf_datasets_path_2",
+    "hf_models_path", "hf_models_path_2",
+    "hf_spaces_path", "hf_spaces_path_2",
+)
+
+
+class ConfigFlags(IntFlag):
+    """Bitmask of configured repository sources and capabilities."""
+
+    NONE = 0
+    GITHUB = 1
+    HUGGINGFACE = 2
+    WORK = 4
+    FORKS = 8
+    DOCS = 16
+    CUSTOM = 32
+    OPENROUTER = 64
+
+    SOURCES = GITHUB | HUGGINGFACE | WORK | FORKS | DOCS | CUSTOM
+
+
 class ConfigManager:
     """Manages loading and saving configuration."""
 
     def __init__(self):
-        self.config = Config()
+        self._config = Config()
+        self._loaded = False
         self._settings_file: Path | None = None
+        self._state_file: Path | None = None
+        # (st_mtime_ns, st_size) of settings.json as last read or written
+        self._last_stat: tuple[int, int] | None = None
+        # Cached ConfigFlags; None until computed or after values change
+        self._flags: ConfigFlags | None = None
+        self._dirs_ready = False
+        # Secrets as last read from / written to the keyring
+        self._stored_secrets: dict[str, str] = {}
+
+    @property
+    def config(self) -> Config:
+        """Get the configuration, loading the settings file on first access."""
+        if not self._loaded:
+            self.load()
+        return self._config
 
     def load(self) -> Config:
         """Load configuration from settings file."""
-        # Ensure directories exist
-        self.config.config_dir.mkdir(parents=True, exist_ok=True)
-        self.config.data_dir.mkdir(parents=True, exist_ok=True)
+        self._loaded = True
 
-        # Load settings file
-        self._settings_file = self.config.config_dir / "settings.json"
-        if self._settings_file.exists():
-            self._load_settings_file()
+        self._ensure_dirs()
 
-        return self.config
+        # Load settings file, skipping the parse if it is unchanged on disk
+        self._settings_file = self._config.config_dir / "settings.json"
+        try:
+            st = os.stat(self._settings_file)
+        except OSError:
+            st = None
+
+        if st is not None:
+            stamp = (st.st_mtime_ns, st.st_size)
+            if stamp != self._last_stat:
+                self._last_stat = stamp
+                self._load_settings_file()
+
+        # UI state is only written by this process, so read it once
+        if self._state_file is None:
+            self._state_file = self._config.config_dir / "state.json"
+            self._load_state_file()
+
+        return self._config
+
+    def _ensure_dirs(self):
+        """Create the config and data directories once per process."""
+        if self._dirs_ready:
+            return
+        self._config.config_dir.mkdir(parents=True, exist_ok=True)
+        self._config.data_dir.mkdir(parents=True, exist_ok=True)
+        self._dirs_ready = True
+
+    def reload(self) -> bool:
+        """Re-read settings.json if it changed on disk. Returns True if reloaded."""
+        previous = self._last_stat
+        self.load()
+        return self._last_stat != previous
 
     def _load_settings_file(self):
         """Load settings from JSON file."""
         try:
-            with open(self._settings_file, "r") as f:
-                settings = json.load(f)
-
-            # Repository base path
-            if "repository_base" in settings:
-                self.config.repository_base = settings["repository_base"]
-
-            # GitHub paths
-            if "repos_base_path" in settings:
-                self.config.repos_base_path = settings["repos_base_path"]
-            if "github_public_path" in settings:
-                self.config.github_public_path = settings["github_public_path"]
-            if "github_private_path" in settings:
-                self.config.github_private_path = settings["github_private_path"]
-
-            # Other paths
-            if "work_repos_path" in settings:
-                self.config.work_repos_path = settings["work_repos_path"]
-            if "forks_path" in settings:
-                self.config.forks_path = settings["forks_path"]
-            if "docs_path" in settings:
-                self.config.docs_path = settings["docs_path"]
-
-            # Hugging Face paths
-            if "hf_datasets_path" in settings:
-                self.config.hf_datasets_path = settings["hf_datasets_path"]
-            if "hf_datasets_path_2" in settings:
-                self.config.hf_datasets_path_2 = settings["hf_datasets_path_2"]
-            if "hf_models_path" in settings:
-                self.config.hf_models_path = settings["hf_models_path"]
-            if "hf_models_path_2" in settings:
-                self.config.hf_models_path_2 = settings["hf_models_path_2"]
-            if "hf_spaces_path" in settings:
-                self.config.hf_spaces_path = settings["hf_spaces_path"]
-            if "hf_spaces_path_2" in settings:
-                self.config.hf_spaces_path_2 = settings["hf_spaces_path_2"]
-
-            # Custom paths
-            if "custom_repo_paths" in settings:
-                self.config.custom_repo_paths = settings["custom_repo_paths"]
-
-            # API keys
-            if "github_pat" in settings:
-                self.config.github_pat = settings["github_pat"]
-            if "openrouter_key" in settings:
-                self.config.openrouter_key = settings["openrouter_key"]
-            if "hf_token" in settings:
-                self.config.hf_token = settings["hf_token"]
-
-            # Model settings
-            if "embedding_model" in settings:
-                self.config.embedding_model = settings["embedding_model"]
-            if "chat_model" in settings:
-                self.config.chat_model = settings["chat_model"]
-
-            # View settings
-            if "window_geometry" in settings:
-                self.config.window_geometry = settings["window_geometry"]
-            if "default_view_mode" in settings:
-                self.config.default_view_mode = settings["default_view_mode"]
-        except (json.JSONDecodeError, IOError):
+            settings = _loads(self._settings_file.read_bytes())
+            if not isinstance(settings, dict):
+                return
+
+            # Skip missing keys and values of the wrong type (e.g. null paths)
+            for name, expected_type in _PERSISTED_TYPES.items():
+                value = settings.get(name)
+                if isinstance(value, expected_type):
+                    setattr(self._config, name, value)
+
+            self._load_secrets(settings)
+            self._flags = None
+        except (ValueError, IOError):
             pass
 
+    def _load_secrets(self, settings: dict):
+        """Read API keys from the keyring, migrating plaintext keys out of the file."""
+        if keyring is None:
+            return
+
+        plaintext = [name for name in _SECRET_FIELDS if settings.get(name)]
+        try:
+            for name in _SECRET_FIELDS:
+                if name in plaintext:
+                    continue  # Value from the file wins; moved to keyring on save
+                value = keyring.get_password(KEYRING_SERVICE, name)
+                if value:
+                    setattr(self._config, name, value)
+                    self._stored_secrets[name] = value
+        except Exception:
+            # No usable backend (headless session, locked store, ...)
+            return
+
+        if plaintext:
+            self.save()
+
+    def _save_secrets(self) -> bool:
+        """Write changed API keys to the keyring. Returns False if unavailable."""
+        if keyring is None:
+            return False
+
+        try:
+            for name in _SECRET_FIELDS:
+                value = getattr(self._config, name)
+                if value == self._stored_secrets.get(name, ""):
+                    continue
+                if value:
+                    keyring.set_password(KEYRING_SERVICE, name, value)
+                else:
+                    keyring.delete_password(KEYRING_SERVICE, name)
+                self._stored_secrets[name] = value
+        except Exception:
+            return False
+        return True
+
+    def _load_state_file(self):
+        """Load UI state from JSON file."""
+        try:
+            state = _loads(self._state_file.read_bytes())
+        except (ValueError, IOError):
+            return
+        if not isinstance(state, dict):
+            return
+
+        for name in _STATE_FIELDS:
+            value = state.get(name)
+            if isinstance(value, _PERSISTED_TYPES[name]):
+                setattr(self._config, name, value)
+
+    def _write_json(self, path: Path, data: dict):
+        """Write JSON to path atomically."""
+        self._ensure_dirs()
+
+        # Write to a temp file and swap it in so a crash never leaves a
+        # truncated file behind
+        tmp_file = path.with_name(path.name + ".tmp")
+        with open(tmp_file, "wb") as f:
+            f.write(_dumps(data))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+
     def save(self):
         """Save settings to JSON file."""
         if not self._settings_file:
             self._settings_file = self.config.config_dir / "settings.json"
 
-        settings = {
-            # Repository base path
-            "repository_base": self.config.repository_base,
-            # GitHub paths
-            "repos_base_path": self.config.repos_base_path,
-            "github_public_path": self.config.github_public_path,
-            "github_private_path": self.config.github_private_path,
-            # Other paths
-            "work_repos_path": self.config.work_repos_path,
-            "forks_path": self.config.forks_path,
-            "docs_path": self.config.docs_path,
-            # Hugging Face paths
-            "hf_datasets_path": self.config.hf_datasets_path,
-            "hf_datasets_path_2": self.config.hf_datasets_path_2,
-            "hf_models_path": self.config.hf_models_path,
-            "hf_models_path_2": self.config.hf_models_path_2,
-            "hf_spaces_path": self.config.hf_spaces_path,
-            "hf_spaces_path_2": self.config.hf_spaces_path_2,
-            # Custom paths
-            "custom_repo_paths": self.config.custom_repo_paths,
-            # API keys
-            "github_pat": self.config.github_pat,
-            "openrouter_key": self.config.openrouter_key,
-            "hf_token": self.config.hf_token,
-            # Model settings
-            "embedding_model": self.config.embedding_model,
-            "chat_model": self.config.chat_model,
-            # View settings
-            "window_geometry": self.config.window_geometry,
-            "default_view_mode": self.config.default_view_mode,
-        }
-
-        self.config.config_dir.mkdir(parents=True, exist_ok=True)
-        with open(self._settings_file, "w") as f:
-            json.dump(settings, f, indent=2)
+        settings = {name: getattr(self.config, name) for name in _SETTINGS_FIELDS}
+
+        # Keep API keys out of the file when the keyring holds them
+        if self._save_secrets():
+            for name in _SECRET_FIELDS:
+                del settings[name]
+
+        self._write_json(self._settings_file, settings)
+
+        # In-memory config matches the file we just wrote
+        st = os.stat(self._settings_file)
+        self._last_stat = (st.st_mtime_ns, st.st_size)
+
+    def save_state(self):
+        """Save UI state (window geometry) to its own JSON file."""
+        if not self._state_file:
+            self._state_file = self.config.config_dir / "state.json"
+
+        self._write_json(
+            self._state_file, {name: getattr(self.config, name) for name in _STATE_FIELDS}
+        )
+
+    def update_state(self, **kwargs):
+        """Update UI state values without rewriting settings.json."""
+        for key, value in kwargs.items():
+            if key in _STATE_FIELDS:
+                setattr(self.config, key, value)
+        self.save_state()
 
     def update(self, **kwargs):
         """Update configuration values."""
         for key, value in kwargs.items():
             if hasattr(self.config, key):
                 setattr(self.config, key, value)
+        self._flags = None
         self.save()
 
+    def _compute_flags(self) -> ConfigFlags:
+        """Compute the configured-source bitmask from current values."""
+        config = self._config
+        flags = ConfigFlags.NONE
+
+        if config.github_pat and any(getattr(config, f) for f in GITHUB_PATH_FIELDS):
+            flags |= ConfigFlags.GITHUB
+        if config.hf_token and any(getattr(config, f) for f in HF_PATH_FIELDS):
+            flags |= ConfigFlags.HUGGINGFACE
+        if config.work_repos_path:
+            flags |= ConfigFlags.WORK
+        if config.forks_path:
+            flags |= ConfigFlags.FORKS
+        if config.docs_path:
+            flags |= ConfigFlags.DOCS
+        if config.custom_repo_paths:
+            flags |= ConfigFlags.CUSTOM
+        if config.openrouter_key:
+            flags |= ConfigFlags.OPENROUTER
+
+        return flags
+
+    @property
+    def flags(self) -> ConfigFlags:
+        """Get the configured-source bitmask."""
+        if not self._loaded:
+            self.load()
+        if self._flags is None:
+            self._flags = self._compute_flags()
+        return self._flags
+
     def is_configured(self) -> bool:
         """Check if minimum configuration is present."""
-        # Check for at least one repository source
-        has_github = bool(self.config.github_pat and (
-            self.config.repos_base_path or
-            self.config.github_public_path or
-            self.config.github_private_path
-        ))
-        has_huggingface = bool(self.config.hf_token and (
-            self.config.hf_datasets_path or
-            self.config.hf_datasets_path_2 or
-            self.config.hf_models_path or
-            self.config.hf_models_path_2 or
-            self.config.hf_spaces_path or
-            self.config.hf_spaces_path_2
-        ))
-        has_work = bool(self.config.work_repos_path)
-        has_forks = bool(self.config.forks_path)
-        has_docs = bool(self.config.docs_path)
-        has_custom = bool(self.config.custom_repo_paths)
-
-        # Check for embedding capability
-        has_openrouter = bool(self.config.openrouter_key)
-
         # Need at least one source AND embedding capability
-        return has_openrouter and (has_github or has_huggingface or has_work or has_forks or has_docs or has_custom)
+        flags = self.flags
+        return bool(flags & ConfigFlags.OPENROUTER) and bool(flags & ConfigFlags.SOURCES)
 
     def has_github_configured(self) -> bool:
         """Check if GitHub is configured."""
-        return bool(self.config.github_pat and (
-            self.config.repos_base_path or
-            self.config.github_public_path or
-            self.config.github_private_path
-        ))
+        return bool(self.flags & ConfigFlags.GITHUB)
 
     def has_huggingface_configured(self) -> bool:
         """Check if Hugging Face is configured."""
-        return bool(self.config.hf_token and (
-            self.config.hf_datasets_path or
-            self.config.hf_datasets_path_2 or
-            self.config.hf_models_path or
-            self.config.hf_models_path_2 or
-            self.config.hf_spaces_path or
-            self.config.hf_spaces_path_2
-        ))
+        return bool(self.flags & ConfigFlags.HUGGINGFACE)
 
     def has_work_repos_configured(self) -> bool:
         """Check if work repos path is configured."""
-        return bool(self.config.work_repos_path)
+        return bool(self.flags & ConfigFlags.WORK)
 
     def has_forks_configured(self) -> bool:
         """Check if forks path is configured."""
-        return bool(self.config.forks_path)
+        return bool(self.flags & ConfigFlags.FORKS)
 
     def has_docs_configured(self) -> bool:
         """Check if docs path is configured."""
-        return bool(self.config.docs_path)
+        return bool(self.flags & ConfigFlags.DOCS)
 
     def has_custom_paths_configured(self) -> bool:
         """Check if custom paths are configured."""
-        return bool(self.config.custom_repo_paths)
+        return bool(self.flags & ConfigFlags.CUSTOM)
 
 
 # Global config manager instance
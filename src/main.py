@@ -20,10 +20,8 @@ def main():
     app.setApplicationName("AI Repo Manager")
     app.setOrganizationName("AI Repo Manager")
 
-    # Load configuration from ~/.config/ai-repo-manager/settings.json
-    config_manager.load()
-
-    # Create and show main window
+    # Create and show main window (configuration from
+    # ~/.config/ai-repo-manager/settings.json is loaded on first access)
     window = MainWindow(config_manager)
     window.show()
 
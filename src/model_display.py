@@ -1,15 +1,18 @@
 """Model display name mappings for human-readable UI labels."""
 
-# Mapping from API model IDs to human-readable display names
-EMBEDDING_MODEL_DISPLAY_NAMES = {
+from functools import lru_cache
+from types import MappingProxyType
+
+# Mapping from API model IDs to human-readable display names (read-only)
+EMBEDDING_MODEL_DISPLAY_NAMES = MappingProxyType({
     "google/gemini-embedding-001": "Gemini Embedding",
     "openai/text-embedding-3-small": "OpenAI Embedding Small",
     "openai/text-embedding-3-large": "OpenAI Embedding Large",
     "openai/text-embedding-ada-002": "OpenAI Ada",
     "qwen/qwen3-embedding-8b": "Qwen Embedding",
-}
+})
 
-CHAT_MODEL_DISPLAY_NAMES = {
+CHAT_MODEL_DISPLAY_NAMES = MappingProxyType({
     "google/gemini-2.5-flash": "Gemini 2.5 Flash",
     "google/gemini-2.5-flash-lite": "Gemini 2.5 Flash Lite",
     "google/gemini-2.0-flash": "Gemini 2.0 Flash",
@@ -17,7 +20,15 @@ CHAT_MODEL_DISPLAY_NAMES = {
     "anthropic/claude-3-haiku": "Claude 3 Haiku",
     "openai/gpt-4o": "GPT-4o",
     "openai/gpt-4o-mini": "GPT-4o Mini",
-}
+})
+
+# Reverse mappings (display name -> model ID) for resolving combobox text
+_EMBEDDING_MODEL_IDS = {name: model_id for model_id, name in EMBEDDING_MODEL_DISPLAY_NAMES.items()}
+_CHAT_MODEL_IDS = {name: model_id for model_id, name in CHAT_MODEL_DISPLAY_NAMES.items()}
+
+# (model_id, display_name) pairs in display order
+_EMBEDDING_MODELS = tuple(EMBEDDING_MODEL_DISPLAY_NAMES.items())
+_CHAT_MODELS = tuple(CHAT_MODEL_DISPLAY_NAMES.items())
 
 
 def get_display_name(model_id: str) -> str:
@@ -28,30 +39,27 @@ def get_display_name(model_id: str) -> str:
     # Check chat models
     if model_id in CHAT_MODEL_DISPLAY_NAMES:
         return CHAT_MODEL_DISPLAY_NAMES[model_id]
-    # Fallback: extract last part and clean up
+    return _fallback_display_name(model_id)
+
+
+@lru_cache(maxsize=64)
+def _fallback_display_name(model_id: str) -> str:
+    """Derive a display name for an unknown model ID from its last path part."""
     return model_id.split("/")[-1].replace("-", " ").title()
 
 
 def get_model_id(display_name: str, model_type: str = "embedding") -> str:
     """Get model ID from display name. Returns display_name if not found."""
-    mapping = (
-        EMBEDDING_MODEL_DISPLAY_NAMES
-        if model_type == "embedding"
-        else CHAT_MODEL_DISPLAY_NAMES
-    )
-    # Reverse lookup
-    for model_id, name in mapping.items():
-        if name == display_name:
-            return model_id
+    mapping = _EMBEDDING_MODEL_IDS if model_type == "embedding" else _CHAT_MODEL_IDS
     # Not found, assume it's already a model ID
-    return display_name
+    return mapping.get(display_name, display_name)
 
 
 def get_embedding_models() -> list[tuple[str, str]]:
     """Get list of (model_id, display_name) tuples for embedding models."""
-    return list(EMBEDDING_MODEL_DISPLAY_NAMES.items())
+    return list(_EMBEDDING_MODELS)
 
 
 def get_chat_models() -> list[tuple[str, str]]:
     """Get list of (model_id, display_name) tuples for chat models."""
-    return list(CHAT_MODEL_DISPLAY_NAMES.items())
+    return list(_CHAT_MODELS)
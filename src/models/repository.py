@@ -1,11 +1,82 @@
 """Repository data model."""
 
-from dataclasses import dataclass, field
+import sys
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 
+# README budget for embedding text, in UTF-8 bytes
+README_EMBED_BYTES = 4000
 
-@dataclass
+
+@lru_cache(maxsize=4096)
+def parse_topics(topics: Optional[str]) -> tuple[str, ...]:
+    """
+    Split a stored comma-joined topics string into interned topics.
+    Memoized on the raw string: many repos share the same (often empty) topic
+    set, so each distinct string is split once and the tuple is shared.
+    """
+    if not topics:
+        return ()
+    return tuple(sys.intern(t) for t in topics.split(",") if t)
+
+
+@lru_cache(maxsize=1024)
+def _build_embedding_text(
+    name: str,
+    description: Optional[str],
+    topics: tuple[str, ...],
+    readme_content: Optional[str],
+) -> str:
+    """Build embedding text from repository fields (memoized on the inputs)."""
+    parts = [name]
+
+    if description:
+        parts.append(description)
+
+    if topics:
+        parts.append("Topics: " + ", ".join(topics))
+
+    if readme_content:
+        # Truncate README to avoid token limits, dropping any split character
+        readme = readme_content.encode("utf-8")[:README_EMBED_BYTES]
+        parts.append(readme.decode("utf-8", errors="ignore"))
+
+    return "\n\n".join(parts)
+
+
+@lru_cache(maxsize=4096)
+def _build_metadata(
+    name: str,
+    full_name: str,
+    description: Optional[str],
+    created_at: datetime,
+    topics: tuple[str, ...],
+    html_url: str,
+    is_local: bool,
+    local_path: Optional[str],
+    is_private: bool,
+    source: str,
+    source_subtype: Optional[str],
+) -> dict:
+    """Build the vector store metadata dict (memoized on the inputs; copy before mutating)."""
+    return {
+        "name": name,
+        "full_name": full_name,
+        "description": description or "",
+        "created_at": int(created_at.timestamp()),
+        "topics": ",".join(topics),
+        "html_url": html_url,
+        "is_local": is_local,
+        "local_path": local_path or "",
+        "is_private": is_private,
+        "source": source,
+        "source_subtype": source_subtype or "",
+    }
+
+
+@dataclass(slots=True)
 class Repository:
     """Represents a repository from various sources (GitHub, Hugging Face, local)."""
 
@@ -13,12 +84,13 @@ class Repository:
     full_name: str  # owner/repo format or path-based identifier
     description: Optional[str]
     created_at: datetime
-    topics: list[str] = field(default_factory=list)
+    topics: tuple[str, ...] = ()
     clone_url: str = ""
     html_url: str = ""
     is_local: bool = False
     local_path: Optional[str] = None
     readme_content: Optional[str] = None
+    readme_etag: Optional[str] = None  # Validator for readme_content (GitHub blob oid)
     is_embedded: bool = False
     is_private: bool = False
     default_branch: str = "main"
@@ -27,51 +99,70 @@ class Repository:
     source: str = "github"  # github, huggingface, work, local
     source_subtype: Optional[str] = None  # For HF: dataset, model, space
 
+    def __post_init__(self):
+        """Intern topic strings so repos sharing a topic share one string."""
+        # Tuples from parse_topics() are already interned and filtered
+        if type(self.topics) is not tuple:
+            self.topics = tuple(sys.intern(t) for t in self.topics if t)
+
     def to_embedding_text(self) -> str:
         """Generate text for embedding."""
-        parts = [self.name]
-
-        if self.description:
-            parts.append(self.description)
-
-        if self.topics:
-            parts.append("Topics: " + ", ".join(self.topics))
-
-        if self.readme_content:
-            # Truncate README to avoid token limits
-            readme = self.readme_content[:4000]
-            parts.append(readme)
-
-        return "\n\n".join(parts)
+        return _build_embedding_text(
+            self.name, self.description, self.topics, self.readme_content
+        )
 
     def to_metadata(self) -> dict:
         """Convert to metadata dict for vector store."""
-        return {
-            "name": self.name,
-            "full_name": self.full_name,
-            "description": self.description or "",
-            "created_at": self.created_at.isoformat(),
-            "topics": ",".join(self.topics),
-            "html_url": self.html_url,
-            "is_local": self.is_local,
-            "local_path": self.local_path or "",
-            "is_private": self.is_private,
-            "source": self.source,
-            "source_subtype": self.source_subtype or "",
-        }
+        return dict(_build_metadata(
+            self.name,
+            self.full_name,
+            self.description,
+            self.created_at,
+            self.topics,
+            self.html_url,
+            self.is_local,
+            self.local_path,
+            self.is_private,
+            self.source,
+            self.source_subtype,
+        ))
+
+    @classmethod
+    def embedding_columns(cls, repos: list["Repository"]) -> dict[str, list]:
+        """
+        Build parallel columns for a batch of repositories in one pass.
+        Returns dict with "ids", "texts" and "metadatas" lists, index-aligned.
+        """
+        n = len(repos)
+        ids = [None] * n
+        texts = [None] * n
+        metadatas = [None] * n
+        # Unbound methods, resolved once rather than per repo
+        to_text = cls.to_embedding_text
+        to_metadata = cls.to_metadata
+        for i, repo in enumerate(repos):
+            ids[i] = repo.full_name
+            texts[i] = to_text(repo)
+            metadatas[i] = to_metadata(repo)
+        return {"ids": ids, "texts": texts, "metadatas": metadatas}
 
     @classmethod
     def from_metadata(cls, metadata: dict) -> "Repository":
         """Create Repository from vector store metadata."""
-        topics = metadata.get("topics", "")
-        topic_list = topics.split(",") if topics else []
+
+        # Epoch seconds; older entries store an ISO 8601 string
+        created_at = metadata["created_at"]
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+        else:
+            created_at = datetime.fromtimestamp(created_at)
 
         return cls(
             name=metadata["name"],
             full_name=metadata["full_name"],
             description=metadata.get("description") or None,
-            created_at=datetime.fromisoformat(metadata["created_at"]),
-            topics=topic_list,
+            created_at=created_at,
+            topics=parse_topics(metadata.get("topics")),
             html_url=metadata.get("html_url", ""),
             is_local=metadata.get("is_local", False),
             local_path=metadata.get("local_path") or None,
@@ -1,29 +1,213 @@
 """SQLite database for persistent repository storage."""
 
 import sqlite3
+import threading
+import weakref
+from array import array
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
-
-from ..models.repository import Repository
+from typing import Iterator, Optional
+
+from ..models.repository import Repository, parse_topics
+
+# Max bound parameters per statement on older SQLite builds
+_MAX_SQL_PARAMS = 999
+
+# Rows pulled from the cursor per fetchmany() call when streaming
+_FETCH_BATCH_SIZE = 500
+
+# Prepared-statement cache size (sqlite3 default is 128)
+_CACHED_STATEMENTS = 256
+
+# Seconds a writer waits for another thread's write transaction to finish
+_BUSY_TIMEOUT = 30.0
+
+# SQL is kept at module level so every call passes the same string object
+# and hits the connection's prepared-statement cache.
+_GET_LAST_SYNC_SQL = "SELECT value FROM sync_state WHERE key = 'last_sync'"
+_SET_LAST_SYNC_SQL = "INSERT OR REPLACE INTO sync_state (key, value) VALUES ('last_sync', ?)"
+_GET_SYNC_STATE_SQL = "SELECT value FROM sync_state WHERE key = ?"
+_SET_SYNC_STATE_SQL = "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)"
+# Columns read by _row_to_repo, in the order it unpacks them
+_REPO_COLUMNS = (
+    "name, full_name, description, created_at, topics, clone_url, html_url, "
+    "local_path, readme_content, embedded_at, is_private, default_branch, "
+    "source, source_subtype, readme_etag"
+)
+_GET_REPO_SQL = f"SELECT {_REPO_COLUMNS} FROM repositories WHERE full_name = ?"
+_GET_ALL_REPOS_SQL = f"SELECT {_REPO_COLUMNS} FROM repositories ORDER BY created_at DESC"
+_GET_PENDING_SQL = f"SELECT {_REPO_COLUMNS} FROM repositories WHERE needs_embedding = 1"
+_GET_BY_SOURCE_SQL = f"SELECT {_REPO_COLUMNS} FROM repositories WHERE source = ? ORDER BY created_at DESC"
+_GET_PUSHED_AT_SQL = "SELECT updated_at, pushed_at FROM repositories WHERE full_name = ?"
+_SELECT_PUSHED_AT_IN_SQL = "SELECT full_name, pushed_at FROM repositories WHERE full_name IN ({})"
+_SELECT_EXISTING_IN_SQL = "SELECT full_name FROM repositories WHERE full_name IN ({})"
+_COUNT_REPOS_SQL = "SELECT COUNT(*) as count FROM repositories"
+_DATA_VERSION_SQL = "PRAGMA data_version"
+_UPDATE_README_SQL = "UPDATE repositories SET readme_content = ?, readme_etag = ? WHERE full_name = ?"
+_UPDATE_LOCAL_PATH_SQL = "UPDATE repositories SET local_path = ? WHERE full_name = ?"
+_UPDATE_LOCAL_PATH_PRIVACY_SQL = "UPDATE repositories SET local_path = ?, is_private = ? WHERE full_name = ?"
+_MARK_EMBEDDED_SQL = "UPDATE repositories SET embedded_at = ?, needs_embedding = 0 WHERE full_name = ?"
+_MARK_EMBEDDED_IN_SQL = (
+    "UPDATE repositories SET embedded_at = ?, needs_embedding = 0 "
+    "WHERE full_name IN (VALUES {})"
+)
+_CLEAR_EMBEDDINGS_SQL = "UPDATE repositories SET embedded_at = NULL, needs_embedding = 1"
+_DELETE_REPO_SQL = "DELETE FROM repositories WHERE full_name = ?"
+_DELETE_BY_SOURCE_SQL = "DELETE FROM repositories WHERE source = ?"
+
+_SELECT_EMBEDDINGS_IN_SQL = (
+    "SELECT content_hash, vector FROM embedding_cache "
+    "WHERE model = ? AND content_hash IN ({})"
+)
+_INSERT_EMBEDDING_SQL = (
+    "INSERT OR REPLACE INTO embedding_cache (model, content_hash, vector) VALUES (?, ?, ?)"
+)
+
+_REPLACE_REPO_SQL = """
+    INSERT OR REPLACE INTO repositories (
+        full_name, name, description, created_at, updated_at, pushed_at,
+        is_private, html_url, clone_url, default_branch, topics,
+        local_path, readme_content, last_synced, needs_embedding
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPSERT_FROM_GITHUB_SQL = """
+    INSERT INTO repositories (
+        full_name, name, description, created_at, updated_at, pushed_at,
+        is_private, html_url, clone_url, default_branch, topics,
+        local_path, last_synced, needs_embedding
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(full_name) DO UPDATE SET
+        name = excluded.name,
+        description = excluded.description,
+        updated_at = excluded.updated_at,
+        pushed_at = excluded.pushed_at,
+        is_private = excluded.is_private,
+        html_url = excluded.html_url,
+        clone_url = excluded.clone_url,
+        default_branch = excluded.default_branch,
+        topics = excluded.topics,
+        local_path = COALESCE(excluded.local_path, local_path),
+        last_synced = excluded.last_synced,
+        needs_embedding = CASE
+            WHEN excluded.pushed_at != repositories.pushed_at THEN 1
+            ELSE repositories.needs_embedding
+        END
+"""
+
+# Parameters 1-9 are an upsert_local_repo_many() row as given; 10 is the
+# sync timestamp and 11 the needs_embedding flag
+_UPSERT_LOCAL_SQL = """
+    INSERT INTO repositories (
+        full_name, name, description, created_at, updated_at, pushed_at,
+        is_private, html_url, clone_url, default_branch, topics,
+        local_path, last_synced, needs_embedding, source, source_subtype
+    ) VALUES (?1, ?2, ?3, ?10, ?10, ?10, ?4, ?5, '', 'main', ?6, ?7, ?10, ?11, ?8, ?9)
+    ON CONFLICT(full_name) DO UPDATE SET
+        name = excluded.name,
+        description = excluded.description,
+        is_private = excluded.is_private,
+        html_url = COALESCE(excluded.html_url, html_url),
+        topics = COALESCE(NULLIF(excluded.topics, ''), topics),
+        local_path = excluded.local_path,
+        last_synced = excluded.last_synced,
+        source = excluded.source,
+        source_subtype = excluded.source_subtype
+"""
+
+
+class _ThreadConn:
+    """Holds a thread's connection in its thread-local slot; see Database._get_conn."""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+
+def _release_conn(conns: list, lock: threading.Lock, conn: sqlite3.Connection):
+    """Close a connection whose thread has exited, unless close() already did."""
+    with lock:
+        try:
+            conns.remove(conn)
+        except ValueError:
+            return
+    conn.close()
 
 
 class Database:
-    """SQLite database for repository metadata and sync state."""
+    """
+    SQLite database for repository metadata and sync state.
+
+    Mutators commit on their own unless called inside a transaction()
+    block; wrap loops of writes in one to pay for a single commit.
+    """
 
     def __init__(self, db_path: str | Path):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn: Optional[sqlite3.Connection] = None
+        # One connection per thread (so readers don't queue behind the shared
+        # connection's mutex), plus each thread's transaction() nesting depth
+        self._local = threading.local()
+        self._conns: list[sqlite3.Connection] = []
+        self._conns_lock = threading.Lock()
         self._init_db()
 
+    @property
+    def _tx_depth(self) -> int:
+        """Nesting depth of transaction() blocks on the current thread."""
+        return getattr(self._local, "tx_depth", 0)
+
+    @_tx_depth.setter
+    def _tx_depth(self, value: int):
+        self._local.tx_depth = value
+
     def _get_conn(self) -> sqlite3.Connection:
-        """Get or create database connection."""
-        if self._conn is None:
-            # check_same_thread=False allows use across threads (safe with our commit-per-operation pattern)
-            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
-            self._conn.row_factory = sqlite3.Row
-        return self._conn
+        """Get or create the current thread's database connection."""
+        holder = getattr(self._local, "holder", None)
+        if holder is None:
+            is_new = not self.db_path.exists() or self.db_path.stat().st_size == 0
+            # check_same_thread=False only so close() can close every thread's connection
+            conn = sqlite3.connect(
+                str(self.db_path),
+                timeout=_BUSY_TIMEOUT,
+                check_same_thread=False,
+                cached_statements=_CACHED_STATEMENTS,
+            )
+            conn.row_factory = sqlite3.Row
+            if is_new:
+                self._configure_new_db(conn)
+            self._configure_conn(conn)
+            with self._conns_lock:
+                self._conns.append(conn)
+            # The thread-local slot is dropped when the thread exits, which
+            # closes its connection; worker threads come and go per operation
+            holder = self._local.holder = _ThreadConn(conn)
+            weakref.finalize(holder, _release_conn, self._conns, self._conns_lock, conn)
+        return holder.conn
+
+    def _configure_new_db(self, conn: sqlite3.Connection):
+        """
+        Set file-format options on a freshly created database.
+        These only take effect before the first table exists and before WAL
+        is enabled; existing databases keep their format (a manual
+        VACUUM in rollback-journal mode would be needed to convert them).
+        """
+        conn.execute("PRAGMA page_size=8192")  # Fewer pages for large README text
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")  # Allow reclaiming deleted space
+
+    def _configure_conn(self, conn: sqlite3.Connection):
+        """Apply per-connection performance PRAGMAs."""
+        if str(self.db_path) != ":memory:":
+            # WAL lets readers proceed during writes; NORMAL skips the
+            # per-commit fsync of the WAL (still safe against corruption)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA wal_autocheckpoint=1000")  # Pages
+            conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-20000")  # 20 MB
 
     def _init_db(self):
         """Initialize database schema."""
@@ -47,7 +231,8 @@ class Database:
                 embedded_at TEXT,
                 needs_embedding INTEGER NOT NULL DEFAULT 1,
                 source TEXT DEFAULT 'github',
-                source_subtype TEXT
+                source_subtype TEXT,
+                readme_etag TEXT
             );
 
             CREATE TABLE IF NOT EXISTS sync_state (
@@ -55,12 +240,30 @@ class Database:
                 value TEXT
             );
 
+            -- Embedding vectors (float32 bytes) keyed by model and text hash
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                model TEXT NOT NULL,
+                content_hash BLOB NOT NULL,
+                vector BLOB NOT NULL,
+                PRIMARY KEY (model, content_hash)
+            ) WITHOUT ROWID;
+
             CREATE INDEX IF NOT EXISTS idx_repos_updated ON repositories(updated_at);
-            CREATE INDEX IF NOT EXISTS idx_repos_needs_embedding ON repositories(needs_embedding);
+            -- Partial index: only the (few) rows still waiting for embedding
+            DROP INDEX IF EXISTS idx_repos_needs_embedding;
+            CREATE INDEX IF NOT EXISTS idx_repos_pending ON repositories(full_name) WHERE needs_embedding = 1;
             CREATE INDEX IF NOT EXISTS idx_repos_source ON repositories(source);
         """)
         conn.commit()
 
+        # Gather planner statistics once; PRAGMA optimize keeps them fresh
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        if not has_stats:
+            conn.execute("ANALYZE")
+            conn.commit()
+
         # Run migrations for existing databases
         self._migrate_db()
 
@@ -95,18 +298,72 @@ class Database:
             except sqlite3.OperationalError:
                 pass  # Column already exists
 
+        if "readme_etag" not in columns:
+            try:
+                conn.execute("ALTER TABLE repositories ADD COLUMN readme_etag TEXT")
+                conn.commit()
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group writes into a single transaction (one commit for the block).
+        Nested blocks join the outermost one; mutators called inside skip
+        their own commit.
+        """
+        conn = self._get_conn()
+        if self._tx_depth == 0 and not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        self._tx_depth += 1
+        try:
+            yield conn
+        except BaseException:
+            self._tx_depth -= 1
+            if self._tx_depth == 0:
+                conn.rollback()
+            raise
+        self._tx_depth -= 1
+        if self._tx_depth == 0:
+            conn.commit()
+
+    def _commit(self):
+        """Commit unless inside a transaction() block."""
+        if self._tx_depth == 0:
+            self._get_conn().commit()
+
+    def optimize(self):
+        """
+        Refresh query planner statistics where SQLite thinks they are stale,
+        and return free pages to the OS (no-op unless auto_vacuum=INCREMENTAL).
+        """
+        conn = self._get_conn()
+        conn.execute("PRAGMA optimize")
+        conn.execute("PRAGMA incremental_vacuum")
+
     def close(self):
-        """Close database connection."""
-        if self._conn:
-            self._conn.close()
-            self._conn = None
+        """Close the database connections of all threads."""
+        with self._conns_lock:
+            conns = self._conns[:]
+            self._conns.clear()
+        for conn in conns:
+            try:
+                conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass  # Best effort; don't block shutdown
+            conn.close()
+        self._local = threading.local()
+
+    def _select_repos(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        """Run a _REPO_COLUMNS query on a cursor that returns plain tuples."""
+        cursor = self._get_conn().cursor()
+        cursor.row_factory = None
+        return cursor.execute(sql, params)
 
     def get_last_sync_time(self) -> Optional[datetime]:
         """Get the last time we synced with GitHub."""
         conn = self._get_conn()
-        row = conn.execute(
-            "SELECT value FROM sync_state WHERE key = 'last_sync'"
-        ).fetchone()
+        row = conn.execute(_GET_LAST_SYNC_SQL).fetchone()
         if row:
             return datetime.fromisoformat(row["value"])
         return None
@@ -114,37 +371,68 @@ class Database:
     def set_last_sync_time(self, dt: datetime):
         """Set the last sync time."""
         conn = self._get_conn()
-        conn.execute(
-            "INSERT OR REPLACE INTO sync_state (key, value) VALUES ('last_sync', ?)",
-            (dt.isoformat(),)
-        )
-        conn.commit()
+        conn.execute(_SET_LAST_SYNC_SQL, (dt.isoformat(),))
+        self._commit()
+
+    def get_last_hf_sync(self, repo_type: str) -> Optional[datetime]:
+        """Get the newest last_modified seen for a Hugging Face repo type."""
+        conn = self._get_conn()
+        row = conn.execute(_GET_SYNC_STATE_SQL, (f"last_hf_sync:{repo_type}",)).fetchone()
+        if row:
+            return datetime.fromisoformat(row["value"])
+        return None
+
+    def set_last_hf_sync(self, repo_type: str, dt: datetime):
+        """Set the newest last_modified seen for a Hugging Face repo type."""
+        conn = self._get_conn()
+        conn.execute(_SET_SYNC_STATE_SQL, (f"last_hf_sync:{repo_type}", dt.isoformat()))
+        self._commit()
 
     def get_repository(self, full_name: str) -> Optional[Repository]:
         """Get a repository by full name."""
-        conn = self._get_conn()
-        row = conn.execute(
-            "SELECT * FROM repositories WHERE full_name = ?",
-            (full_name,)
-        ).fetchone()
+        row = self._select_repos(_GET_REPO_SQL, (full_name,)).fetchone()
         if row:
             return self._row_to_repo(row)
         return None
 
-    def get_all_repositories(self) -> list[Repository]:
-        """Get all repositories from the database."""
+    def _iter_repos(self, cursor: sqlite3.Cursor) -> Iterator[Repository]:
+        """Yield repositories from a cursor, fetching rows in bounded batches."""
+        while True:
+            rows = cursor.fetchmany(_FETCH_BATCH_SIZE)
+            if not rows:
+                return
+            for row in rows:
+                yield self._row_to_repo(row)
+
+    def iter_all_repositories(self) -> Iterator[Repository]:
+        """Stream all repositories from the database, newest first."""
+        return self._iter_repos(self._select_repos(_GET_ALL_REPOS_SQL))
+
+    def _data_version(self) -> tuple[int, int]:
+        """Version of the database as seen by the current thread's connection.
+
+        PRAGMA data_version moves when another connection commits and
+        total_changes when this one writes, so together they change on
+        every mutation visible to this thread.
+        """
         conn = self._get_conn()
-        rows = conn.execute(
-            "SELECT * FROM repositories ORDER BY created_at DESC"
-        ).fetchall()
-        return [self._row_to_repo(row) for row in rows]
+        return conn.execute(_DATA_VERSION_SQL).fetchone()[0], conn.total_changes
+
+    def get_all_repositories(self) -> list[Repository]:
+        """Get all repositories from the database.
+
+        The result is cached per thread and reused until the database changes.
+        """
+        version = self._data_version()
+        cached = getattr(self._local, "all_repos", None)
+        if cached is None or cached[0] != version:
+            cached = (version, list(self.iter_all_repositories()))
+            self._local.all_repos = cached
+        return list(cached[1])
 
     def get_repos_needing_embedding(self) -> list[Repository]:
         """Get repositories that need embedding updates."""
-        conn = self._get_conn()
-        rows = conn.execute(
-            "SELECT * FROM repositories WHERE needs_embedding = 1"
-        ).fetchall()
+        rows = self._select_repos(_GET_PENDING_SQL).fetchall()
         return [self._row_to_repo(row) for row in rows]
 
     def upsert_repository(self, repo: Repository, from_github: bool = False):
@@ -152,10 +440,7 @@ class Database:
         conn = self._get_conn()
 
         # Check if repo exists and if it changed
-        existing = conn.execute(
-            "SELECT updated_at, pushed_at FROM repositories WHERE full_name = ?",
-            (repo.full_name,)
-        ).fetchone()
+        existing = conn.execute(_GET_PUSHED_AT_SQL, (repo.full_name,)).fetchone()
 
         needs_embedding = 1
         if existing:
@@ -167,13 +452,7 @@ class Database:
 
         topics_str = ",".join(repo.topics) if repo.topics else ""
 
-        conn.execute("""
-            INSERT OR REPLACE INTO repositories (
-                full_name, name, description, created_at, updated_at, pushed_at,
-                is_private, html_url, clone_url, default_branch, topics,
-                local_path, readme_content, last_synced, needs_embedding
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
+        conn.execute(_REPLACE_REPO_SQL, (
             repo.full_name,
             repo.name,
             repo.description,
@@ -190,7 +469,7 @@ class Database:
             datetime.now().isoformat(),
             needs_embedding,
         ))
-        conn.commit()
+        self._commit()
 
     def upsert_from_github(
         self,
@@ -211,46 +490,7 @@ class Database:
         Upsert repository from GitHub API data.
         Returns True if the repo is new or changed (needs embedding).
         """
-        conn = self._get_conn()
-
-        # Check if repo exists and if pushed_at changed
-        existing = conn.execute(
-            "SELECT pushed_at FROM repositories WHERE full_name = ?",
-            (full_name,)
-        ).fetchone()
-
-        needs_embedding = 1
-        if existing:
-            old_pushed = existing["pushed_at"]
-            if old_pushed == pushed_at.isoformat():
-                # No changes since last sync
-                needs_embedding = 0
-
-        topics_str = ",".join(topics) if topics else ""
-
-        conn.execute("""
-            INSERT INTO repositories (
-                full_name, name, description, created_at, updated_at, pushed_at,
-                is_private, html_url, clone_url, default_branch, topics,
-                local_path, last_synced, needs_embedding
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(full_name) DO UPDATE SET
-                name = excluded.name,
-                description = excluded.description,
-                updated_at = excluded.updated_at,
-                pushed_at = excluded.pushed_at,
-                is_private = excluded.is_private,
-                html_url = excluded.html_url,
-                clone_url = excluded.clone_url,
-                default_branch = excluded.default_branch,
-                topics = excluded.topics,
-                local_path = COALESCE(excluded.local_path, local_path),
-                last_synced = excluded.last_synced,
-                needs_embedding = CASE
-                    WHEN excluded.pushed_at != repositories.pushed_at THEN 1
-                    ELSE repositories.needs_embedding
-                END
-        """, (
+        return self.upsert_from_github_many([(
             full_name,
             name,
             description,
@@ -261,86 +501,136 @@ class Database:
             html_url,
             clone_url,
             default_branch,
-            topics_str,
+            ",".join(topics) if topics else "",
             local_path,
-            datetime.now().isoformat(),
-            needs_embedding,
-        ))
-        conn.commit()
-
-        return needs_embedding == 1
+        )])[0]
 
-    def update_readme(self, full_name: str, readme_content: str):
-        """Update README content for a repository."""
+    def upsert_from_github_many(
+        self, rows: list[tuple], synced_at: Optional[str] = None
+    ) -> list[bool]:
+        """
+        Upsert many repositories from GitHub API data in one transaction.
+        Each row is a tuple already in column order (see _UPSERT_FROM_GITHUB_SQL):
+        (full_name, name, description, created_at, updated_at, pushed_at,
+        is_private, html_url, clone_url, default_branch, topics, local_path)
+        with timestamps as ISO strings, is_private as 0/1 and topics comma-joined.
+        synced_at (ISO string, default now) is stored as last_synced for every row.
+        Returns, per row, True if the repo is new or changed (needs embedding).
+        """
+        if not rows:
+            return []
+
+        now = synced_at or datetime.now().isoformat()
+        full_names = [row[0] for row in rows]
+
+        # The pre-select runs inside the write transaction, so concurrent
+        # syncs can't both count the same repo as new or changed
+        with self.transaction() as conn:
+            # Fetch previous pushed_at for the whole batch with chunked IN queries
+            existing: dict[str, str] = {}
+            for i in range(0, len(full_names), _MAX_SQL_PARAMS):
+                chunk = full_names[i:i + _MAX_SQL_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                for row in conn.execute(
+                    _SELECT_PUSHED_AT_IN_SQL.format(placeholders),
+                    chunk,
+                ):
+                    existing[row["full_name"]] = row["pushed_at"]
+
+            changed = []
+            params = []
+            for row in rows:
+                # New repos have no previous value, so they count as changed
+                is_changed = existing.get(row[0]) != row[5]
+                changed.append(is_changed)
+                params.append(row + (now, 1 if is_changed else 0))
+
+            conn.executemany(_UPSERT_FROM_GITHUB_SQL, params)
+
+        return changed
+
+    def update_readme(self, full_name: str, readme_content: str, readme_etag: Optional[str] = None):
+        """
+        Update README content for a repository.
+        readme_etag is the validator the content was fetched with, if any
+        (stored so the next fetch can skip an unchanged README).
+        """
         conn = self._get_conn()
-        conn.execute(
-            "UPDATE repositories SET readme_content = ? WHERE full_name = ?",
-            (readme_content, full_name)
-        )
-        conn.commit()
+        conn.execute(_UPDATE_README_SQL, (readme_content, readme_etag, full_name))
+        self._commit()
+
+    def update_readme_many(self, rows: list[tuple[str, Optional[str], str]]):
+        """
+        Update README content for many repositories in one transaction.
+        Each row is a tuple (readme_content, readme_etag, full_name).
+        """
+        if not rows:
+            return
+        with self.transaction() as conn:
+            conn.executemany(_UPDATE_README_SQL, rows)
 
     def update_local_path(self, full_name: str, local_path: Optional[str]):
         """Update local path for a repository."""
         conn = self._get_conn()
-        conn.execute(
-            "UPDATE repositories SET local_path = ? WHERE full_name = ?",
-            (local_path, full_name)
-        )
-        conn.commit()
+        conn.execute(_UPDATE_LOCAL_PATH_SQL, (local_path, full_name))
+        self._commit()
+
+    def update_local_paths_many(self, rows: list[tuple[str, int, str]]):
+        """Update (local_path, is_private, full_name) rows in one transaction."""
+        if not rows:
+            return
+        with self.transaction() as conn:
+            conn.executemany(_UPDATE_LOCAL_PATH_PRIVACY_SQL, rows)
 
     def mark_embedded(self, full_name: str):
         """Mark a repository as embedded."""
         conn = self._get_conn()
-        conn.execute(
-            "UPDATE repositories SET embedded_at = ?, needs_embedding = 0 WHERE full_name = ?",
-            (datetime.now().isoformat(), full_name)
-        )
-        conn.commit()
+        conn.execute(_MARK_EMBEDDED_SQL, (datetime.now().isoformat(), full_name))
+        self._commit()
 
     def mark_embedded_batch(self, full_names: list[str]):
         """Mark multiple repositories as embedded."""
         conn = self._get_conn()
         now = datetime.now().isoformat()
-        conn.executemany(
-            "UPDATE repositories SET embedded_at = ?, needs_embedding = 0 WHERE full_name = ?",
-            [(now, fn) for fn in full_names]
-        )
-        conn.commit()
+        # One UPDATE per chunk of keys instead of one per row
+        step = _MAX_SQL_PARAMS - 1  # One parameter is taken by embedded_at
+        with self.transaction():
+            for i in range(0, len(full_names), step):
+                chunk = full_names[i:i + step]
+                placeholders = ",".join(["(?)"] * len(chunk))
+                conn.execute(_MARK_EMBEDDED_IN_SQL.format(placeholders), (now, *chunk))
 
     def delete_repository(self, full_name: str):
         """Delete a repository from the database."""
         conn = self._get_conn()
-        conn.execute("DELETE FROM repositories WHERE full_name = ?", (full_name,))
-        conn.commit()
+        conn.execute(_DELETE_REPO_SQL, (full_name,))
+        self._commit()
 
     def get_repo_count(self) -> int:
         """Get total number of repositories."""
         conn = self._get_conn()
-        row = conn.execute("SELECT COUNT(*) as count FROM repositories").fetchone()
+        row = conn.execute(_COUNT_REPOS_SQL).fetchone()
         return row["count"]
 
+    def iter_repositories_by_source(self, source: str) -> Iterator[Repository]:
+        """Stream repositories filtered by source."""
+        return self._iter_repos(self._select_repos(_GET_BY_SOURCE_SQL, (source,)))
+
     def get_repositories_by_source(self, source: str) -> list[Repository]:
         """Get repositories filtered by source."""
-        conn = self._get_conn()
-        rows = conn.execute(
-            "SELECT * FROM repositories WHERE source = ? ORDER BY created_at DESC",
-            (source,)
-        ).fetchall()
-        return [self._row_to_repo(row) for row in rows]
+        return list(self.iter_repositories_by_source(source))
 
     def clear_all_embeddings(self):
         """Clear all embeddings and mark all repos as needing embedding."""
         conn = self._get_conn()
-        conn.execute(
-            "UPDATE repositories SET embedded_at = NULL, needs_embedding = 1"
-        )
-        conn.commit()
+        conn.execute(_CLEAR_EMBEDDINGS_SQL)
+        self._commit()
 
     def delete_repositories_by_source(self, source: str):
         """Delete all repositories from a specific source."""
         conn = self._get_conn()
-        conn.execute("DELETE FROM repositories WHERE source = ?", (source,))
-        conn.commit()
+        conn.execute(_DELETE_BY_SOURCE_SQL, (source,))
+        self._commit()
 
     def upsert_local_repo(
         self,
@@ -358,85 +648,97 @@ class Database:
         Upsert repository from local filesystem scan.
         Returns True if the repo is new (needs embedding).
         """
-        conn = self._get_conn()
-        now = datetime.now()
-
-        # Check if repo exists
-        existing = conn.execute(
-            "SELECT full_name FROM repositories WHERE full_name = ?",
-            (full_name,)
-        ).fetchone()
-
-        needs_embedding = 1 if not existing else 0
-        topics_str = ",".join(topics) if topics else ""
-
-        conn.execute("""
-            INSERT INTO repositories (
-                full_name, name, description, created_at, updated_at, pushed_at,
-                is_private, html_url, clone_url, default_branch, topics,
-                local_path, last_synced, needs_embedding, source, source_subtype
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(full_name) DO UPDATE SET
-                name = excluded.name,
-                description = excluded.description,
-                is_private = excluded.is_private,
-                html_url = COALESCE(excluded.html_url, html_url),
-                topics = COALESCE(NULLIF(excluded.topics, ''), topics),
-                local_path = excluded.local_path,
-                last_synced = excluded.last_synced,
-                source = excluded.source,
-                source_subtype = excluded.source_subtype
-        """, (
+        return self.upsert_local_repo_many([(
             full_name,
             name,
             description,
-            now.isoformat(),
-            now.isoformat(),
-            now.isoformat(),
             1 if is_private else 0,
             html_url,
-            "",  # clone_url
-            "main",
-            topics_str,
+            ",".join(topics) if topics else "",
             local_path,
-            now.isoformat(),
-            needs_embedding,
             source,
             source_subtype,
-        ))
-        conn.commit()
+        )])[0]
 
-        return needs_embedding == 1
+    def upsert_local_repo_many(self, rows: list[tuple]) -> list[bool]:
+        """
+        Upsert many repositories from local/Hugging Face scans in one transaction.
+        Each row is a tuple (full_name, name, description, is_private,
+        html_url, topics, local_path, source, source_subtype) with
+        is_private as 0/1 and topics comma-joined.
+        Returns, per row, True if the repo is new (needs embedding).
+        """
+        if not rows:
+            return []
 
-    def _row_to_repo(self, row: sqlite3.Row) -> Repository:
-        """Convert database row to Repository object."""
-        topics = row["topics"].split(",") if row["topics"] else []
+        conn = self._get_conn()
 
-        # Handle source column that may not exist in older databases
-        try:
-            source = row["source"] or "github"
-        except (KeyError, IndexError):
-            source = "github"
+        # Find which repos already exist with chunked IN queries
+        existing: set[str] = set()
+        full_names = [row[0] for row in rows]
+        for i in range(0, len(full_names), _MAX_SQL_PARAMS):
+            chunk = full_names[i:i + _MAX_SQL_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            for (full_name,) in conn.execute(_SELECT_EXISTING_IN_SQL.format(placeholders), chunk):
+                existing.add(full_name)
 
-        try:
-            source_subtype = row["source_subtype"]
-        except (KeyError, IndexError):
-            source_subtype = None
+        # Rows are bound as given, extended with the shared timestamp and flag
+        now = datetime.now().isoformat()
+        is_new = [row[0] not in existing for row in rows]
+        params = [row + (now, int(new)) for row, new in zip(rows, is_new)]
+
+        with self.transaction():
+            conn.executemany(_UPSERT_LOCAL_SQL, params)
+
+        return is_new
+
+    def get_cached_embeddings(self, model: str, content_hashes: list[bytes]) -> dict[bytes, list[float]]:
+        """Look up cached embeddings for a model; returns dict of content_hash to vector."""
+        conn = self._get_conn()
+        found = {}
+        step = _MAX_SQL_PARAMS - 1  # One parameter is taken by model
+        for i in range(0, len(content_hashes), step):
+            chunk = content_hashes[i:i + step]
+            placeholders = ",".join("?" * len(chunk))
+            for content_hash, vector in conn.execute(
+                _SELECT_EMBEDDINGS_IN_SQL.format(placeholders), (model, *chunk)
+            ):
+                found[content_hash] = array("f", vector).tolist()
+        return found
+
+    def cache_embeddings(self, model: str, items: list[tuple[bytes, list[float]]]):
+        """Store embeddings for a model as (content_hash, vector) pairs, as float32."""
+        conn = self._get_conn()
+        with self.transaction():
+            conn.executemany(
+                _INSERT_EMBEDDING_SQL,
+                [(model, content_hash, array("f", vector).tobytes()) for content_hash, vector in items],
+            )
+
+    def _row_to_repo(self, row: tuple) -> Repository:
+        """Convert a _REPO_COLUMNS row to a Repository object."""
+        (
+            name, full_name, description, created_at, topics, clone_url, html_url,
+            local_path, readme_content, embedded_at, is_private, default_branch,
+            source, source_subtype, readme_etag,
+        ) = row
 
         return Repository(
-            name=row["name"],
-            full_name=row["full_name"],
-            description=row["description"],
-            created_at=datetime.fromisoformat(row["created_at"]),
-            topics=topics,
-            clone_url=row["clone_url"] or "",
-            html_url=row["html_url"] or "",
-            is_local=bool(row["local_path"]),
-            local_path=row["local_path"],
-            readme_content=row["readme_content"],
-            is_embedded=row["embedded_at"] is not None,
-            is_private=bool(row["is_private"]),
-            default_branch=row["default_branch"] or "main",
-            source=source,
+            name=name,
+            full_name=full_name,
+            description=description,
+            created_at=datetime.fromisoformat(created_at),
+            topics=parse_topics(topics),
+            clone_url=clone_url or "",
+            html_url=html_url or "",
+            is_local=bool(local_path),
+            local_path=local_path,
+            readme_content=readme_content,
+            readme_etag=readme_etag,
+            is_embedded=embedded_at is not None,
+            is_private=bool(is_private),
+            default_branch=default_branch or "main",
+            # _migrate_db guarantees the column; rows from before it may be NULL
+            source=source or "github",
             source_subtype=source_subtype,
         )
@@ -1,23 +1,86 @@
 """GitHub API service for fetching repository information."""
 
+import json
+import os
+import threading
+import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from typing import Generator, Callable, Optional
+from typing import Generator, Callable, Optional, Sequence
 
+import httpx
 from github import Github, GithubException
 from github.Repository import Repository as GHRepo
 
 from ..models.repository import Repository
 from .database import Database
 
+# Repositories written to the database per transaction during sync
+UPSERT_BATCH_SIZE = 500
+# ...or sooner, once this many seconds have passed since the last write
+UPSERT_FLUSH_INTERVAL = 0.25
+
+# README filenames tried for local checkouts, in order of preference
+_README_CANDIDATES = (
+    "README.md",
+    "README.MD",
+    "readme.md",
+    "README.rst",
+    "README.txt",
+    "README",
+)
+
+# Remote READMEs: repos per GraphQL request, and the README extensions in
+# order of preference (names are matched case-insensitively, as GitHub does)
+GITHUB_GRAPHQL_URL = "https://api.github.com/graphql"
+README_GRAPHQL_BATCH = 50
+_README_EXTENSIONS = ("md", "markdown", "rst", "txt", "")
+
+# Page size requested from the GitHub API (its maximum)
+REPOS_PER_PAGE = 100
+# Upper bound on concurrent API workers when the caller doesn't pick a count;
+# below it the pool is sized to the amount of work
+MAX_FETCH_WORKERS = 32
+
+
+def _readme_rank(name: str) -> int | None:
+    """Preference of a root file name as the README (lower wins), or None if it isn't one."""
+    stem, _, ext = name.lower().partition(".")
+    if stem != "readme":
+        return None
+    try:
+        return _README_EXTENSIONS.index(ext)
+    except ValueError:
+        return len(_README_EXTENSIONS)  # e.g. README.zh-CN.md, README.adoc
+
 
 class GitHubService:
     """Service for interacting with GitHub API."""
 
-    def __init__(self, token: str, repos_base_path: str):
-        self.github = Github(token, per_page=100)  # Max page size
+    def __init__(self, token: str, repos_base_path: str, extra_base_paths: Sequence[str] = ()):
+        self.github = Github(token, per_page=REPOS_PER_PAGE)
+        self._token = token
+        # GraphQL requests, which PyGithub doesn't wrap, share one pooled
+        # client (thread-safe) instead of a new connection per request
+        self._http = httpx.Client(
+            headers={"Authorization": f"Bearer {token}"},
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=MAX_FETCH_WORKERS),
+        )
+        # PyGithub clients aren't thread-safe; see _thread_client()
+        self._thread_state = threading.local()
         self.repos_base_path = Path(repos_base_path)
+        # Directories searched for checkouts, repos_base_path first; one
+        # listing then resolves repos against all of them
+        self._base_paths = [Path(p) for p in (repos_base_path, *extra_base_paths) if p]
+        # Checkout name -> its directory under the base paths (lazy, see _get_local_repos)
+        self._local_repos: dict[str, Path] | None = None
+
+    def close(self):
+        """Close the GraphQL HTTP client and the PyGithub connection."""
+        self._http.close()
+        self.github.close()
 
     def get_authenticated_user(self) -> str:
         """Get the authenticated user's login name."""
@@ -45,7 +108,7 @@ class GitHubService:
     ) -> tuple[int, int]:
         """
         Sync repositories from GitHub to the local database.
-        Uses parallel workers for faster processing.
+        Listing pages are fetched by parallel workers.
         Returns (total_repos, changed_repos) count.
         """
         user = self.github.get_user()
@@ -56,14 +119,39 @@ class GitHubService:
         if progress_callback:
             progress_callback(f"Fetching repository list from GitHub ({expected_total} expected)...", 0, 0)
 
-        # Collect all repos first (pagination is handled by PyGithub)
-        # This can take a while for large accounts
+        # Collect all repos first. Pages are fetched concurrently: totalCount
+        # costs one small request and tells us how many pages to ask for.
+        repos_list = user.get_repos(sort="updated", direction="desc")
+        page_count = -(-repos_list.totalCount // REPOS_PER_PAGE)
+
+        # PyGithub's Requester keeps one connection per client and isn't
+        # thread-safe, so each worker lists its pages through its own client
+        worker_state = threading.local()
+        worker_clients: list[Github] = []
+        clients_lock = threading.Lock()
+
+        def fetch_page(page: int) -> list[GHRepo]:
+            client = getattr(worker_state, "client", None)
+            if client is None:
+                client = worker_state.client = Github(self._token, per_page=REPOS_PER_PAGE)
+                with clients_lock:
+                    worker_clients.append(client)
+            return client.get_user().get_repos(sort="updated", direction="desc").get_page(page)
+
         gh_repos = []
-        repos_iter = user.get_repos(sort="updated", direction="desc")
-        for i, gh_repo in enumerate(repos_iter):
-            gh_repos.append(gh_repo)
-            if progress_callback and (i + 1) % 50 == 0:
-                progress_callback(f"Fetching repository list... ({i + 1} fetched)", i + 1, expected_total)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # map() keeps page order, so the list stays sorted by update time
+                for page in executor.map(fetch_page, range(page_count)):
+                    gh_repos.extend(page)
+                    if progress_callback:
+                        progress_callback(
+                            f"Fetching repository list... ({len(gh_repos)} fetched)",
+                            len(gh_repos), expected_total,
+                        )
+        finally:
+            for client in worker_clients:
+                client.close()
 
         total = len(gh_repos)
 
@@ -74,86 +162,85 @@ class GitHubService:
         if cancel_check and cancel_check():
             return 0, 0
 
-        # Process repos in parallel using ThreadPoolExecutor
-        current = 0
-        changed = 0
-
-        def process_repo(gh_repo: GHRepo) -> dict:
-            """Process a single repo - fetch topics and check local path."""
-            local_path = self._find_local_path(gh_repo.name)
-
-            # Get topics (may require extra API call)
-            try:
-                topics = gh_repo.get_topics()
-            except GithubException:
-                topics = []
-
-            return {
-                "full_name": gh_repo.full_name,
-                "name": gh_repo.name,
-                "description": gh_repo.description,
-                "created_at": gh_repo.created_at,
-                "updated_at": gh_repo.updated_at or gh_repo.created_at,
-                "pushed_at": gh_repo.pushed_at or gh_repo.created_at,
-                "is_private": gh_repo.private,
-                "html_url": gh_repo.html_url,
-                "clone_url": gh_repo.clone_url,
-                "default_branch": gh_repo.default_branch or "main",
-                "topics": topics,
-                "local_path": str(local_path) if local_path else None,
-            }
+        # One timestamp for the whole sync, used as every row's last_synced
+        sync_started_at = datetime.now()
+        synced_at = sync_started_at.isoformat()
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all tasks
-            future_to_repo = {
-                executor.submit(process_repo, gh_repo): gh_repo
-                for gh_repo in gh_repos
-            }
+        # Rescan local checkouts once up front
+        self._local_repos = None
+        self._get_local_repos()
 
-            # Process results as they complete
-            for future in as_completed(future_to_repo):
-                # Check for cancellation
-                if cancel_check and cancel_check():
-                    executor.shutdown(wait=False, cancel_futures=True)
-                    break
+        # Everything needed is already in the listing payload, so rows are
+        # built inline; upserts are written in size/time-bounded batches
+        current = 0
+        changed = 0
+        pending: list[tuple] = []
+        last_flush = time.monotonic()
 
-                current += 1
+        for gh_repo in gh_repos:
+            if cancel_check and cancel_check():
+                break
 
-                try:
-                    repo_data = future.result()
+            current += 1
 
-                    if progress_callback:
-                        progress_callback(f"Syncing {repo_data['name']}...", current, total)
+            try:
+                row = self._repo_to_row(gh_repo)
+            except Exception:
+                # Skip malformed repos but continue
+                continue
 
-                    # Upsert to database - returns True if changed
-                    is_changed = database.upsert_from_github(**repo_data)
+            if progress_callback:
+                progress_callback(f"Syncing {row[1]}...", current, total)
 
-                    if is_changed:
-                        changed += 1
+            pending.append(row)
+            now = time.monotonic()
+            if len(pending) >= UPSERT_BATCH_SIZE or now - last_flush >= UPSERT_FLUSH_INTERVAL:
+                changed += sum(database.upsert_from_github_many(pending, synced_at))
+                pending = []
+                last_flush = now
 
-                except Exception:
-                    # Skip failed repos but continue
-                    pass
+        changed += sum(database.upsert_from_github_many(pending, synced_at))
 
         # Update sync time
-        database.set_last_sync_time(datetime.now())
+        database.set_last_sync_time(sync_started_at)
+        database.optimize()
 
         if progress_callback:
             progress_callback(f"Synced {current} repositories ({changed} changed)", current, current)
 
         return current, changed
 
+    def _repo_to_row(self, gh_repo: GHRepo) -> tuple:
+        """Build a Database.upsert_from_github_many() row from a listed repo."""
+        local_path = self._find_local_path(gh_repo.name)
+
+        # Topics are included in the repo listing payload
+        topics = gh_repo.topics or []
+
+        created_at = gh_repo.created_at
+        return (
+            gh_repo.full_name,
+            gh_repo.name,
+            gh_repo.description,
+            created_at.isoformat(),
+            (gh_repo.updated_at or created_at).isoformat(),
+            (gh_repo.pushed_at or created_at).isoformat(),
+            1 if gh_repo.private else 0,
+            gh_repo.html_url,
+            gh_repo.clone_url,
+            gh_repo.default_branch or "main",
+            ",".join(topics),
+            str(local_path) if local_path else None,
+        )
+
     def _convert_repo(self, gh_repo: GHRepo) -> Repository:
         """Convert GitHub repository to our Repository model."""
         # Check if repo exists locally
         local_path = self._find_local_path(gh_repo.name)
         is_local = local_path is not None
 
-        # Get topics
-        try:
-            topics = gh_repo.get_topics()
-        except GithubException:
-            topics = []
+        # Topics are included in the repo listing payload
+        topics = gh_repo.topics or []
 
         return Repository(
             name=gh_repo.name,
@@ -169,17 +256,27 @@ class GitHubService:
             default_branch=gh_repo.default_branch or "main",
         )
 
+    def _get_local_repos(self) -> dict[str, Path]:
+        """
+        Scan the base paths once for directories containing a .git entry.
+        A name found under several of them resolves to the first base path.
+        """
+        if self._local_repos is None:
+            repos: dict[str, Path] = {}
+            for base_path in self._base_paths:
+                try:
+                    with os.scandir(base_path) as entries:
+                        for entry in entries:
+                            if entry.is_dir() and os.path.exists(os.path.join(entry.path, ".git")):
+                                repos.setdefault(entry.name, base_path / entry.name)
+                except OSError:
+                    pass  # Base path missing or unreadable
+            self._local_repos = repos
+        return self._local_repos
+
     def _find_local_path(self, repo_name: str) -> Path | None:
         """Check if repository exists locally."""
-        if not self.repos_base_path.exists():
-            return None
-
-        # Check direct path
-        direct_path = self.repos_base_path / repo_name
-        if direct_path.exists() and (direct_path / ".git").exists():
-            return direct_path
-
-        return None
+        return self._get_local_repos().get(repo_name)
 
     def read_readme(self, repo: Repository) -> str | None:
         """Read README content for a local repository."""
@@ -188,30 +285,35 @@ class GitHubService:
 
         local_path = Path(repo.local_path)
 
-        # Try common README filenames
-        readme_names = [
-            "README.md",
-            "README.MD",
-            "readme.md",
-            "README.rst",
-            "README.txt",
-            "README",
-        ]
+        # One directory read instead of a stat per candidate name
+        try:
+            entries = set(os.listdir(local_path))
+        except OSError:
+            return None
 
-        for name in readme_names:
-            readme_path = local_path / name
-            if readme_path.exists():
+        for name in _README_CANDIDATES:
+            if name in entries:
                 try:
-                    return readme_path.read_text(encoding="utf-8")
-                except (IOError, UnicodeDecodeError):
+                    # Binary read skips the text-mode decoder/newline layer;
+                    # stray invalid bytes shouldn't cost us the whole README
+                    with open(local_path / name, "rb") as f:
+                        return f.read().decode("utf-8", errors="replace")
+                except OSError:
                     continue
 
         return None
 
+    def _thread_client(self) -> Github:
+        """A Github client for the current thread, for calls made from worker pools."""
+        client = getattr(self._thread_state, "client", None)
+        if client is None:
+            client = self._thread_state.client = Github(self._token, per_page=REPOS_PER_PAGE)
+        return client
+
     def fetch_remote_readme(self, full_name: str) -> str | None:
-        """Fetch README from GitHub API."""
+        """Fetch README from GitHub API (safe to call from several threads)."""
         try:
-            gh_repo = self.github.get_repo(full_name)
+            gh_repo = self._thread_client().get_repo(full_name)
             readme = gh_repo.get_readme()
             return readme.decoded_content.decode("utf-8")
         except GithubException:
@@ -226,37 +328,163 @@ class GitHubService:
             readme = self.fetch_remote_readme(repo.full_name)
         return repo.full_name, readme
 
+    def _graphql(self, full_names: list[str], selections: list[str]) -> list[dict]:
+        """
+        Run one GraphQL request selecting selections[i] on repo full_names[i].
+        Returns each repo's data in order ({} for missing/inaccessible repos).
+        Raises httpx.HTTPError if the request itself fails, and ValueError if
+        GraphQL reports any error other than a repo not being found (rate
+        limits, query complexity, ...), so callers can fall back to REST.
+        """
+        aliases = []
+        for i, (full_name, selection) in enumerate(zip(full_names, selections)):
+            owner, _, name = full_name.partition("/")
+            aliases.append(
+                f"r{i}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{ {selection} }}"
+            )
+
+        response = self._http.post(
+            GITHUB_GRAPHQL_URL,
+            json={"query": "query { " + " ".join(aliases) + " }"},
+        )
+        response.raise_for_status()
+
+        # Missing/inaccessible repos come back as null with a NOT_FOUND entry
+        # in "errors"; anything else means the answers can't be trusted
+        payload = response.json()
+        errors = [e for e in payload.get("errors") or () if e.get("type") != "NOT_FOUND"]
+        data = payload.get("data")
+        if errors or data is None:
+            message = errors[0].get("message") if errors else "no data"
+            raise ValueError(f"GitHub GraphQL query failed: {message}")
+        return [data.get(f"r{i}") or {} for i in range(len(full_names))]
+
+    def _query_readmes_graphql(
+        self, full_names: list[str], with_text: bool = True
+    ) -> dict[str, tuple[str | None, str]]:
+        """
+        Look up READMEs for up to README_GRAPHQL_BATCH repos via GraphQL.
+        The README is picked from each repo's root tree by case-insensitive
+        name, then (with_text) its text is fetched in a second request.
+        Returns dict mapping full_name to (text, blob oid); with_text=False
+        only asks for the oids, which is enough to tell if a README changed.
+        Raises httpx.HTTPError if a request itself fails.
+        """
+        tree_selection = 'object(expression: "HEAD:") { ... on Tree { entries { name type oid } } }'
+        trees = self._graphql(full_names, [tree_selection] * len(full_names))
+        found: dict[str, tuple[str, str]] = {}  # full_name -> (file name, oid)
+        for full_name, repo_data in zip(full_names, trees):
+            entries = (repo_data.get("object") or {}).get("entries") or []
+            best_rank = None
+            for entry in entries:
+                rank = _readme_rank(entry["name"]) if entry.get("type") == "blob" else None
+                if rank is not None and (best_rank is None or rank < best_rank):
+                    best_rank = rank
+                    found[full_name] = (entry["name"], entry["oid"])
+
+        if not with_text:
+            return {full_name: (None, oid) for full_name, (_, oid) in found.items()}
+
+        names = list(found)
+        if not names:
+            return {}
+        blobs = self._graphql(names, [
+            f'object(expression: {json.dumps("HEAD:" + found[n][0])}) {{ ... on Blob {{ text }} }}'
+            for n in names
+        ])
+        results = {}
+        for full_name, repo_data in zip(names, blobs):
+            text = (repo_data.get("object") or {}).get("text")
+            if text:
+                results[full_name] = (text, found[full_name][1])
+        return results
+
+    def fetch_remote_readmes_batch(self, repos: list[Repository]) -> dict[str, str]:
+        """
+        Fetch READMEs from GitHub for many repos via batched GraphQL queries.
+        Repos whose stored readme_etag still matches the README's blob oid
+        keep their cached readme_content without downloading it again; the
+        others get readme_etag set to the oid of the fetched README.
+        Falls back to per-repo REST calls for a batch whose request fails.
+        Returns dict mapping full_name to readme content.
+        """
+        results = {}
+        for i in range(0, len(repos), README_GRAPHQL_BATCH):
+            chunk = repos[i:i + README_GRAPHQL_BATCH]
+            try:
+                # Cheap oid-only check for READMEs we already have
+                cached = [r for r in chunk if r.readme_etag and r.readme_content]
+                stale = [r for r in chunk if not (r.readme_etag and r.readme_content)]
+                if cached:
+                    oids = self._query_readmes_graphql([r.full_name for r in cached], with_text=False)
+                    for repo in cached:
+                        if oids.get(repo.full_name, (None, None))[1] == repo.readme_etag:
+                            results[repo.full_name] = repo.readme_content
+                        else:
+                            stale.append(repo)
+
+                if stale:
+                    fetched = self._query_readmes_graphql([r.full_name for r in stale])
+                    for repo in stale:
+                        if repo.full_name in fetched:
+                            results[repo.full_name], repo.readme_etag = fetched[repo.full_name]
+            except (httpx.HTTPError, ValueError):
+                for repo in chunk:
+                    readme = self.fetch_remote_readme(repo.full_name)
+                    if readme:
+                        results[repo.full_name] = readme
+                        repo.readme_etag = None
+        return results
+
     def fetch_readmes_parallel(
         self,
         repos: list[Repository],
         progress_callback: Optional[Callable[[str, int, int], None]] = None,
-        max_workers: int = 8,
+        max_workers: Optional[int] = None,
     ) -> dict[str, str]:
         """
-        Fetch READMEs for multiple repos in parallel.
+        Fetch READMEs for multiple repos (local first, then remote).
+        Remote READMEs are fetched in GraphQL batches, several batches in parallel,
+        and each repo's readme_etag is updated to match what was returned.
         Returns dict mapping full_name to readme content.
         """
         results = {}
         total = len(repos)
         current = 0
 
+        # Local checkouts are cheap to read; only the rest go to the API
+        remote: list[Repository] = []
+        for repo in repos:
+            readme = self.read_readme(repo) if repo.is_local and repo.local_path else None
+            if readme:
+                results[repo.full_name] = readme
+                repo.readme_etag = None
+                current += 1
+                if progress_callback:
+                    progress_callback(f"Read README for {repo.name}...", current, total)
+            else:
+                remote.append(repo)
+
+        chunks = [
+            remote[i:i + README_GRAPHQL_BATCH]
+            for i in range(0, len(remote), README_GRAPHQL_BATCH)
+        ]
+        if max_workers is None:
+            max_workers = min(MAX_FETCH_WORKERS, max(4, len(chunks)))
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_repo = {
-                executor.submit(self.fetch_readme_for_repo, repo): repo
-                for repo in repos
+            future_to_chunk = {
+                executor.submit(self.fetch_remote_readmes_batch, chunk): chunk
+                for chunk in chunks
             }
 
-            for future in as_completed(future_to_repo):
-                current += 1
-                repo = future_to_repo[future]
+            for future in as_completed(future_to_chunk):
+                current += len(future_to_chunk[future])
 
                 if progress_callback:
-                    progress_callback(f"Fetching README for {repo.name}...", current, total)
+                    progress_callback("Fetching READMEs from GitHub...", current, total)
 
                 try:
-                    full_name, readme = future.result()
-                    if readme:
-                        results[full_name] = readme
+                    results.update(future.result())
                 except Exception:
                     pass
 
@@ -270,6 +498,7 @@ class GitHubService:
         import shutil
         try:
             shutil.rmtree(repo.local_path)
+            self._local_repos = None
             return True
         except (IOError, OSError):
             return False
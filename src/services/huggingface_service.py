@@ -1,13 +1,89 @@
 """Hugging Face API service for fetching repository information."""
 
+import asyncio
+import logging
+import operator
+import os
+import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 from typing import Callable, Optional
 
+import httpx
+
 from ..models.repository import Repository
 from .database import Database
-from .vcs_detector import detect_vcs, get_readme_from_repo, get_description_from_repo
+from .vcs_detector import detect_vcs, get_readme_from_repo, get_description_from_repo_cached
+
+logger = logging.getLogger(__name__)
+
+# Hub REST API, used directly for concurrent README/card lookups
+HF_API_URL = "https://huggingface.co/api"
+_HF_API_KINDS = {"model": "models", "dataset": "datasets", "space": "spaces"}
+# Web URL prefix per repo type; models live at the site root
+_HF_URL_PREFIXES = {
+    "model": "https://huggingface.co/",
+    "dataset": "https://huggingface.co/datasets/",
+    "space": "https://huggingface.co/spaces/",
+}
+# Matched against the raw path bytes, avoiding a lowercased copy per repo
+_PRIVATE_RE = re.compile(rb"private", re.IGNORECASE)
+# Fields present on every huggingface_hub ModelInfo/DatasetInfo/SpaceInfo
+_HF_INFO_ATTRS = operator.attrgetter("id", "tags", "private")
+# Local README reads are disk-bound; a small pool near the CPU count is enough
+_LOCAL_READ_WORKERS = min(16, (os.cpu_count() or 1) * 2)
+# Upper bound on concurrent Hub requests when the caller doesn't pick a count
+_MAX_FETCH_WORKERS = 32
+
+
+def _read_local_readmes(repos: list[Repository]) -> list[Optional[str]]:
+    """Read the local README of each repo on the local I/O pool, in order."""
+    with ThreadPoolExecutor(max_workers=_LOCAL_READ_WORKERS) as executor:
+        return list(executor.map(lambda r: get_readme_from_repo(Path(r.local_path)), repos))
+
+
+@lru_cache(maxsize=4096)
+def _detect_vcs_cached(path_str: str):
+    """detect_vcs() memoized by path; cleared at the start and end of each sync."""
+    return detect_vcs(Path(path_str))
+
+
+_hf_backend_configured = False
+
+
+def _configure_hf_http_backend(pool_size: int = _MAX_FETCH_WORKERS):
+    """
+    Give huggingface_hub a pooled keep-alive session with retries (once per
+    process), so repeated Hub calls reuse their TLS connection.
+    Newer huggingface_hub releases pool connections themselves and no
+    longer offer configure_http_backend; nothing to do there.
+    """
+    global _hf_backend_configured
+    if _hf_backend_configured:
+        return
+    _hf_backend_configured = True
+
+    try:
+        import requests
+        from huggingface_hub import configure_http_backend
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+    except ImportError:
+        return
+
+    def make_session() -> requests.Session:
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=3, backoff_factor=0.3),
+        )
+        session.mount("https://", adapter)
+        return session
+
+    configure_http_backend(backend_factory=make_session)
 
 
 class HuggingFaceService:
@@ -44,12 +120,15 @@ class HuggingFaceService:
 
         self._api = None
         self._user = None
+        # base_path -> names listed in it, only populated while a sync is running
+        self._base_path_entries: Optional[dict[Path, frozenset[str]]] = None
 
     def _get_api(self):
         """Lazy initialization of Hugging Face API client."""
         if self._api is None:
             try:
                 from huggingface_hub import HfApi
+                _configure_hf_http_backend()
                 self._api = HfApi(token=self.token)
             except ImportError:
                 raise ImportError(
@@ -76,8 +155,7 @@ class HuggingFaceService:
 
     def _infer_privacy_from_path(self, path: Path) -> bool:
         """Infer if a repository is private based on its path containing 'private'."""
-        path_str = str(path).lower()
-        return "private" in path_str
+        return _PRIVATE_RE.search(os.fsencode(path)) is not None
 
     def _find_local_path(self, repo_id: str, repo_type: str) -> Optional[Path]:
         """Check if repository exists locally in configured paths."""
@@ -93,20 +171,32 @@ class HuggingFaceService:
 
         # Extract just the repo name (without namespace)
         repo_name = repo_id.split("/")[-1] if "/" in repo_id else repo_id
+        full_name = repo_id.replace("/", "_")
+
+        # During a sync, match names against one listing per base path
+        if self._base_path_entries is not None:
+            for base_path in base_paths:
+                entries = self._base_path_entries[base_path]
+                for name in (repo_name, full_name):
+                    if name in entries:
+                        candidate = base_path / name
+                        if _detect_vcs_cached(str(candidate)):
+                            return candidate
+            return None
 
         # Check all configured paths
         for base_path in base_paths:
             if not base_path.exists():
                 continue
 
-            # Check direct path
+            # Check direct path (detect_vcs also rejects missing paths)
             direct_path = base_path / repo_name
-            if direct_path.exists() and detect_vcs(direct_path):
+            if _detect_vcs_cached(str(direct_path)):
                 return direct_path
 
             # Also check with full repo_id path structure
-            full_path = base_path / repo_id.replace("/", "_")
-            if full_path.exists() and detect_vcs(full_path):
+            full_path = base_path / full_name
+            if _detect_vcs_cached(str(full_path)):
                 return full_path
 
         return None
@@ -125,102 +215,138 @@ class HuggingFaceService:
         api = self._get_api()
         username = self.get_authenticated_user()
 
-        all_repos = []
-
-        # Fetch datasets
-        if self.datasets_path:
-            if progress_callback:
-                progress_callback("Fetching datasets from Hugging Face...", 0, 0)
-
-            try:
-                datasets = list(api.list_datasets(author=username))
-                for ds in datasets:
-                    all_repos.append(("dataset", ds))
-            except Exception:
-                pass
-
-        # Fetch models
-        if self.models_path:
-            if progress_callback:
-                progress_callback("Fetching models from Hugging Face...", 0, 0)
-
-            try:
-                models = list(api.list_models(author=username))
-                for model in models:
-                    all_repos.append(("model", model))
-            except Exception:
-                pass
-
-        # Fetch spaces
-        if self.spaces_path:
-            if progress_callback:
-                progress_callback("Fetching spaces from Hugging Face...", 0, 0)
-
-            try:
-                spaces = list(api.list_spaces(author=username))
-                for space in spaces:
-                    all_repos.append(("space", space))
-            except Exception:
-                pass
-
-        total = len(all_repos)
-        if progress_callback:
-            progress_callback(f"Processing {total} Hugging Face repositories...", 0, total)
+        # List each base path once; repo dirs are then found by set lookup
+        _detect_vcs_cached.cache_clear()
+        self._base_path_entries = {}
+        for p in (*self.datasets_paths, *self.models_paths, *self.spaces_paths):
+            if p and p not in self._base_path_entries:
+                try:
+                    self._base_path_entries[p] = frozenset(os.listdir(p))
+                except OSError:
+                    self._base_path_entries[p] = frozenset()
+        try:
+            return self._sync_repos(database, api, username, progress_callback, cancel_check, max_workers)
+        finally:
+            self._base_path_entries = None
+            _detect_vcs_cached.cache_clear()
 
-        if cancel_check and cancel_check():
-            return 0, 0
+    def _refresh_local_paths(
+        self, database: Database, repo_types: set[str], skip: set[str]
+    ):
+        """
+        Re-resolve local_path (and path-inferred privacy) for stored HF repos
+        of repo_types, other than those in skip, against the current base
+        path listings; only rows that changed are written.
+        """
+        updates = []
+        for repo in database.iter_repositories_by_source("huggingface"):
+            if repo.full_name in skip or repo.source_subtype not in repo_types:
+                continue
+            repo_id = repo.full_name.split(":", 2)[2]
+            local_path = self._find_local_path(repo_id, repo.source_subtype)
+            path_str = str(local_path) if local_path else ""
+            if path_str == (repo.local_path or ""):
+                continue
+            # Without a clone, privacy stays as last reported by the Hub
+            is_private = self._infer_privacy_from_path(local_path) if local_path else repo.is_private
+            updates.append((path_str, 1 if is_private else 0, repo.full_name))
+        database.update_local_paths_many(updates)
 
+    def _sync_repos(
+        self,
+        database: Database,
+        api,
+        username: str,
+        progress_callback: Optional[Callable[[str, int, int], None]],
+        cancel_check: Optional[Callable[[], bool]],
+        max_workers: int,
+    ) -> tuple[int, int]:
+        """Body of sync_repos_to_database(), run with the per-sync caches set up."""
+        # Newest last_modified seen per repo type; saved as the next cursor
+        cursors: dict[str, datetime] = {}
         current = 0
-        new_repos = 0
 
-        def process_repo(repo_type: str, repo_info) -> dict:
-            """Process a single HF repo."""
-            repo_id = repo_info.id
+        def process_repo(repo_type: str, repo_info) -> tuple:
+            """
+            Process a single HF repo.
+            Returns a row for Database.upsert_local_repo_many().
+            """
+            try:
+                repo_id, tags, private = _HF_INFO_ATTRS(repo_info)
+            except AttributeError:
+                repo_id = repo_info.id
+                tags = getattr(repo_info, "tags", None)
+                private = getattr(repo_info, "private", False)
             local_path = self._find_local_path(repo_id, repo_type)
 
             # Infer privacy from path
-            is_private = False
             if local_path:
                 is_private = self._infer_privacy_from_path(local_path)
-            elif hasattr(repo_info, "private"):
-                is_private = repo_info.private
-
-            # Get created/updated times
-            created_at = getattr(repo_info, "created_at", None) or datetime.now()
-            last_modified = getattr(repo_info, "last_modified", None) or created_at
-
-            # Build HTML URL
-            if repo_type == "dataset":
-                html_url = f"https://huggingface.co/datasets/{repo_id}"
-            elif repo_type == "space":
-                html_url = f"https://huggingface.co/spaces/{repo_id}"
             else:
-                html_url = f"https://huggingface.co/{repo_id}"
-
-            # Get tags as topics
-            tags = getattr(repo_info, "tags", []) or []
-
-            return {
-                "full_name": f"hf:{repo_type}:{repo_id}",
-                "name": repo_id.split("/")[-1] if "/" in repo_id else repo_id,
-                "description": getattr(repo_info, "description", None),
-                "local_path": str(local_path) if local_path else None,
-                "is_private": is_private,
-                "source": "huggingface",
-                "source_subtype": repo_type,
-                "topics": tags[:10],  # Limit tags
-                "html_url": html_url,
-                "created_at": created_at,
-                "last_modified": last_modified,
-            }
+                is_private = private
+
+            return (
+                f"hf:{repo_type}:{repo_id}",
+                repo_id.split("/")[-1] if "/" in repo_id else repo_id,
+                getattr(repo_info, "description", None),
+                1 if is_private else 0,
+                _HF_URL_PREFIXES[repo_type] + repo_id,  # html_url
+                ",".join(tags[:10]) if tags else "",  # Tags as topics, limited
+                str(local_path) if local_path else "",
+                "huggingface",
+                repo_type,
+            )
+
+        # Rows are collected here and written in one transaction at the end
+        rows: list[tuple] = []
+
+        listings = (
+            ("dataset", self.datasets_path, api.list_datasets, "datasets"),
+            ("model", self.models_path, api.list_models, "models"),
+            ("space", self.spaces_path, api.list_spaces, "spaces"),
+        )
 
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_repo = {
-                executor.submit(process_repo, repo_type, repo_info): (repo_type, repo_info)
-                for repo_type, repo_info in all_repos
-            }
+            # Submit repos as the listing pages arrive, so local path
+            # resolution overlaps with the remaining API requests
+            futures = []
+            for repo_type, base_path, list_repos, label in listings:
+                if not base_path:
+                    continue
 
-            for future in as_completed(future_to_repo):
+                if progress_callback:
+                    progress_callback(f"Fetching {label} from Hugging Face...", 0, 0)
+
+                # The Hub sorts newest-first, so stop at the first repo not modified
+                # since the previous sync; older ones are already in the database
+                cursor = database.get_last_hf_sync(repo_type)
+                newest = cursor
+                try:
+                    for repo_info in list_repos(author=username, sort="last_modified"):
+                        if cancel_check and cancel_check():
+                            break
+                        modified = getattr(repo_info, "last_modified", None)
+                        if modified is not None:
+                            if cursor is not None and modified <= cursor:
+                                break
+                            if newest is None or modified > newest:
+                                newest = modified
+                        futures.append(executor.submit(process_repo, repo_type, repo_info))
+                except (OSError, httpx.HTTPError) as e:
+                    # Hub/network failure part-way through the listing; keep
+                    # this type's cursor so the next sync lists it again
+                    logger.warning("Listing Hugging Face %s failed: %s", label, e)
+                    if progress_callback:
+                        progress_callback(f"Error fetching {label} from Hugging Face: {e}", 0, 0)
+                    continue
+                if newest is not None:
+                    cursors[repo_type] = newest
+
+            total = len(futures)
+            if progress_callback:
+                progress_callback(f"Processing {total} Hugging Face repositories...", 0, total)
+
+            for future in as_completed(futures):
                 if cancel_check and cancel_check():
                     executor.shutdown(wait=False, cancel_futures=True)
                     break
@@ -228,29 +354,25 @@ class HuggingFaceService:
                 current += 1
 
                 try:
-                    repo_data = future.result()
+                    row = future.result()
+                except Exception:
+                    continue
 
-                    if progress_callback:
-                        progress_callback(f"Syncing {repo_data['name']}...", current, total)
-
-                    # Upsert to database
-                    is_new = database.upsert_local_repo(
-                        full_name=repo_data["full_name"],
-                        name=repo_data["name"],
-                        description=repo_data["description"],
-                        local_path=repo_data["local_path"] or "",
-                        is_private=repo_data["is_private"],
-                        source=repo_data["source"],
-                        source_subtype=repo_data["source_subtype"],
-                        topics=repo_data["topics"],
-                        html_url=repo_data["html_url"],
-                    )
-
-                    if is_new:
-                        new_repos += 1
+                if progress_callback:
+                    progress_callback(f"Syncing {row[1]}...", current, total)
 
-                except Exception:
-                    pass
+                rows.append(row)
+
+        new_repos = sum(database.upsert_local_repo_many(rows))
+
+        # Only advance the cursors after a complete pass
+        if not (cancel_check and cancel_check()):
+            # Repos older than the cursor aren't listed again, but their clones
+            # (and so local path and privacy) can still change
+            listed_types = {repo_type for repo_type, base_path, _, _ in listings if base_path}
+            self._refresh_local_paths(database, listed_types, {row[0] for row in rows})
+            for repo_type, newest in cursors.items():
+                database.set_last_hf_sync(repo_type, newest)
 
         if progress_callback:
             progress_callback(f"Synced {current} HF repositories ({new_repos} new)", current, current)
@@ -286,42 +408,186 @@ class HuggingFaceService:
 
         return repo.full_name, readme
 
-    def fetch_readmes_parallel(
+    async def _fetch_card_description(
+        self, client: httpx.AsyncClient, repo: Repository
+    ) -> Optional[str]:
+        """Fetch the model card description for an HF repo from the Hub API."""
+        # full_name is hf:type:owner/name
+        parts = repo.full_name.split(":", 2)
+        if len(parts) < 3 or parts[1] not in _HF_API_KINDS:
+            return None
+        response = await client.get(f"{HF_API_URL}/{_HF_API_KINDS[parts[1]]}/{parts[2]}")
+        if response.status_code != 200:
+            return None
+        card_data = response.json().get("cardData") or {}
+        return card_data.get("description") or None
+
+    async def _list_card_descriptions(
+        self, client: httpx.AsyncClient, kind: str, author: str
+    ) -> dict[str, str]:
+        """
+        List an author's repos of one kind with card data inline (one request
+        per page) and return a dict mapping repo_id to card description.
+        """
+        descriptions = {}
+        url = f"{HF_API_URL}/{kind}"
+        params = {"author": author, "cardData": "true", "full": "true", "limit": 1000}
+        while url:
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+            for info in response.json():
+                description = (info.get("cardData") or {}).get("description")
+                if description:
+                    descriptions[info["id"]] = description
+            # Next page URL already carries the query parameters
+            url = response.links.get("next", {}).get("url")
+            params = None
+        return descriptions
+
+    @staticmethod
+    def _group_by_owner(repos: list[Repository]) -> dict[tuple[str, str], list[Repository]]:
+        """Group HF repos by (repo type, owner); a group shares one listing."""
+        groups: dict[tuple[str, str], list[Repository]] = {}
+        for repo in repos:
+            _, repo_type, repo_id = repo.full_name.split(":", 2)
+            owner = repo_id.split("/")[0] if "/" in repo_id else ""
+            groups.setdefault((repo_type, owner), []).append(repo)
+        return groups
+
+    async def list_card_descriptions(
+        self, repos: list[Repository]
+    ) -> dict[tuple[str, str], dict[str, str]]:
+        """
+        Card descriptions for every (repo type, owner) shared by several of
+        repos, one paginated listing each. Pass the result to
+        fetch_readmes_async() when fetching repos in batches, so the
+        listings aren't repeated per batch. Failed listings are left out.
+        """
+        groups = self._group_by_owner([repo for repo in repos if repo.source_subtype])
+        keys = [
+            (repo_type, owner)
+            for (repo_type, owner), group in groups.items()
+            if len(group) > 1 and owner and repo_type in _HF_API_KINDS
+        ]
+        if not keys:
+            return {}
+
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+        async with httpx.AsyncClient(headers=headers, timeout=30.0) as client:
+            listed = await asyncio.gather(
+                *(self._list_card_descriptions(client, _HF_API_KINDS[t], o) for t, o in keys),
+                return_exceptions=True,
+            )
+        return {
+            key: descriptions
+            for key, descriptions in zip(keys, listed)
+            if not isinstance(descriptions, Exception)
+        }
+
+    async def fetch_readmes_async(
         self,
         repos: list[Repository],
         progress_callback: Optional[Callable[[str, int, int], None]] = None,
-        max_workers: int = 8,
+        max_workers: Optional[int] = None,
+        card_descriptions: Optional[dict[tuple[str, str], dict[str, str]]] = None,
     ) -> dict[str, str]:
         """
-        Fetch READMEs for multiple repos in parallel.
+        Fetch READMEs for multiple repos (local first, then the Hub API).
+        Remote repos are looked up with one paginated listing per type and
+        owner, concurrently and at most max_workers at a time (by default,
+        scaled to the number of lookups). With card_descriptions (from
+        list_card_descriptions()), those listings are used instead and
+        only repos outside them are looked up, one by one.
         Returns dict mapping full_name to readme content.
         """
         results = {}
         total = len(repos)
-        current = 0
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            future_to_repo = {
-                executor.submit(self.fetch_readme_for_repo, repo): repo
-                for repo in repos
-            }
-
-            for future in as_completed(future_to_repo):
+        # Local files are read on a thread pool, off the event loop; only
+        # repos without a local README go to the Hub
+        local = [repo for repo in repos if repo.local_path]
+        local_readmes = await asyncio.to_thread(_read_local_readmes, local) if local else []
+        local_found = {r.full_name: readme for r, readme in zip(local, local_readmes) if readme}
+        results.update(local_found)
+        current = len(local_found)
+        if progress_callback and current:
+            progress_callback("Read local READMEs...", current, total)
+
+        remote = []
+        for repo in repos:
+            if repo.full_name in local_found:
+                continue
+            if repo.source_subtype:
+                remote.append(repo)
+            else:
                 current += 1
-                repo = future_to_repo[future]
-
-                if progress_callback:
-                    progress_callback(f"Fetching README for {repo.name}...", current, total)
 
-                try:
-                    full_name, readme = future.result()
+        if not remote:
+            return results
+
+        headers = {"Authorization": f"Bearer {self.token}"} if self.token else {}
+
+        # Repos sharing a type and owner are covered by one listing; a lone
+        # repo is cheaper to look up on its own
+        groups = self._group_by_owner(remote)
+
+        if max_workers is None:
+            max_workers = min(_MAX_FETCH_WORKERS, max(4, len(groups)))
+        semaphore = asyncio.Semaphore(max_workers)
+        # Keep exactly as many pooled connections as requests in flight
+        limits = httpx.Limits(max_connections=max_workers, max_keepalive_connections=max_workers)
+
+        async with httpx.AsyncClient(headers=headers, timeout=30.0, limits=limits) as client:
+            async def fetch_group(
+                repo_type: str, owner: str, group: list[Repository]
+            ) -> list[tuple[Repository, Optional[str]]]:
+                async with semaphore:
+                    if card_descriptions is not None:
+                        listed = card_descriptions.get((repo_type, owner))
+                        if listed is not None:
+                            return [(r, listed.get(r.full_name.split(":", 2)[2])) for r in group]
+                    elif len(group) > 1 and owner and repo_type in _HF_API_KINDS:
+                        try:
+                            listed = await self._list_card_descriptions(
+                                client, _HF_API_KINDS[repo_type], owner
+                            )
+                            return [(r, listed.get(r.full_name.split(":", 2)[2])) for r in group]
+                        except (httpx.HTTPError, ValueError):
+                            pass  # Fall back to per-repo lookups
+                    found = []
+                    for repo in group:
+                        try:
+                            found.append((repo, await self._fetch_card_description(client, repo)))
+                        except (httpx.HTTPError, ValueError):
+                            found.append((repo, None))
+                    return found
+
+            tasks = [fetch_group(t, o, g) for (t, o), g in groups.items()]
+            for next_done in asyncio.as_completed(tasks):
+                for repo, readme in await next_done:
+                    current += 1
                     if readme:
-                        results[full_name] = readme
-                except Exception:
-                    pass
+                        results[repo.full_name] = readme
+
+                if progress_callback:
+                    progress_callback("Fetching READMEs from Hugging Face...", current, total)
 
         return results
 
+    def fetch_readmes_parallel(
+        self,
+        repos: list[Repository],
+        progress_callback: Optional[Callable[[str, int, int], None]] = None,
+        max_workers: Optional[int] = None,
+    ) -> dict[str, str]:
+        """
+        Fetch READMEs for multiple repos in parallel.
+        Synchronous wrapper around fetch_readmes_async() for callers without
+        a running event loop.
+        Returns dict mapping full_name to readme content.
+        """
+        return asyncio.run(self.fetch_readmes_async(repos, progress_callback, max_workers))
+
 
 class LocalRepoService:
     """Service for scanning and syncing local repositories."""
@@ -359,7 +625,7 @@ class LocalRepoService:
             return 0, 0
 
         current = 0
-        new_repos = 0
+        rows: list[tuple] = []
 
         for vcs_info in repos:
             if cancel_check and cancel_check():
@@ -367,31 +633,29 @@ class LocalRepoService:
 
             current += 1
 
-            # Generate a unique full_name
-            full_name = f"{self.source_name}:{vcs_info.name}"
-
             # Infer privacy from path
-            is_private = "private" in str(vcs_info.root_path).lower()
+            is_private = _PRIVATE_RE.search(os.fsencode(vcs_info.root_path)) is not None
 
             # Get description from repo
-            description = get_description_from_repo(vcs_info.root_path)
+            description = get_description_from_repo_cached(vcs_info.root_path)
 
             if progress_callback:
                 progress_callback(f"Syncing {vcs_info.name}...", current, total)
 
-            # Upsert to database
-            is_new = database.upsert_local_repo(
-                full_name=full_name,
-                name=vcs_info.name,
-                description=description,
-                local_path=str(vcs_info.root_path),
-                is_private=is_private,
-                source=self.source_name,
-                source_subtype=vcs_info.vcs_type.value,
-            )
-
-            if is_new:
-                new_repos += 1
+            rows.append((
+                f"{self.source_name}:{vcs_info.name}",  # Unique full_name
+                vcs_info.name,
+                description,
+                1 if is_private else 0,
+                None,  # html_url
+                "",  # topics
+                str(vcs_info.root_path),
+                self.source_name,
+                vcs_info.vcs_type.value,
+            ))
+
+        # One transaction for the whole scan
+        new_repos = sum(database.upsert_local_repo_many(rows))
 
         if progress_callback:
             progress_callback(f"Synced {current} repos from {self.source_name} ({new_repos} new)", current, current)
@@ -409,13 +673,16 @@ class LocalRepoService:
         self,
         repos: list[Repository],
         progress_callback: Optional[Callable[[str, int, int], None]] = None,
-        max_workers: int = 8,
+        max_workers: Optional[int] = None,
     ) -> dict[str, str]:
         """Fetch READMEs for multiple local repos in parallel."""
         results = {}
         total = len(repos)
         current = 0
 
+        if max_workers is None:
+            max_workers = max(1, min(_LOCAL_READ_WORKERS, total))
+
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_repo = {
                 executor.submit(self.fetch_readme_for_repo, repo): repo
@@ -1,11 +1,33 @@
 """OpenRouter API service for embeddings and chat."""
 
+import asyncio
+import hashlib
+import importlib.util
+import threading
+
 import httpx
-from typing import AsyncGenerator
+from typing import TYPE_CHECKING, AsyncGenerator
+
+if TYPE_CHECKING:
+    from .database import Database
 
 
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
+# HTTP/2 needs the h2 package (httpx[http2]); fall back to HTTP/1.1 without it
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+_POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=32,
+    max_connections=64,
+    keepalive_expiry=30.0,
+)
+
+
+def _content_hash(text: str) -> bytes:
+    """Key for the embedding cache: 128-bit BLAKE2b digest of the text."""
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
 
 class OpenRouterService:
     """Service for OpenRouter API - embeddings and chat completions."""
@@ -15,32 +37,59 @@ class OpenRouterService:
         api_key: str,
         embedding_model: str = "openai/text-embedding-3-small",
         chat_model: str = "anthropic/claude-sonnet-4",
+        embedding_cache: "Database | None" = None,
     ):
         self.api_key = api_key
         self.embedding_model = embedding_model
         self.chat_model = chat_model
-        self._client: httpx.AsyncClient | None = None
+        # Optional persistent cache; unchanged texts are not re-embedded
+        self.embedding_cache = embedding_cache
+        # One client per event loop: a client's connections belong to the
+        # loop that opened them, and the service is shared across threads
+        self._clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._clients_lock = threading.Lock()
 
     @property
     def client(self) -> httpx.AsyncClient:
-        """Get or create async HTTP client."""
-        if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
-                base_url=OPENROUTER_BASE_URL,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json",
-                    "HTTP-Referer": "https://github.com/danielrosehill/AI-Repo-Manager",
-                    "X-Title": "AI Repo Manager",
-                },
-                timeout=60.0,
-            )
-        return self._client
+        """
+        Get or create async HTTP client.
+        One pooled client per running event loop is kept until close() is
+        awaited on that loop; with HTTP/2, concurrent requests share a
+        single multiplexed connection to OpenRouter.
+        """
+        loop = asyncio.get_running_loop()
+        with self._clients_lock:
+            client = self._clients.get(loop)
+            if client is None or client.is_closed:
+                client = self._clients[loop] = self._new_client()
+        return client
+
+    def _new_client(self) -> httpx.AsyncClient:
+        """Create a pooled HTTP client for OpenRouter."""
+        return httpx.AsyncClient(
+            base_url=OPENROUTER_BASE_URL,
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json",
+                "HTTP-Referer": "https://github.com/danielrosehill/AI-Repo-Manager",
+                "X-Title": "AI Repo Manager",
+            },
+            timeout=httpx.Timeout(60.0, connect=5.0),
+            # Pool/protocol settings live on the transport; retries cover
+            # connection failures only, never a request already sent
+            transport=httpx.AsyncHTTPTransport(
+                http2=_HTTP2_AVAILABLE,
+                limits=_POOL_LIMITS,
+                retries=2,
+            ),
+        )
 
     async def close(self):
-        """Close the HTTP client."""
-        if self._client and not self._client.is_closed:
-            await self._client.aclose()
+        """Close the HTTP client of the running event loop."""
+        with self._clients_lock:
+            client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client and not client.is_closed:
+            await client.aclose()
 
     async def create_embedding(self, text: str) -> list[float]:
         """Create embedding for text using OpenRouter."""
@@ -55,8 +104,8 @@ class OpenRouterService:
         data = response.json()
         return data["data"][0]["embedding"]
 
-    async def create_embeddings_batch(self, texts: list[str]) -> list[list[float]]:
-        """Create embeddings for multiple texts."""
+    async def _post_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Create embeddings for one request's worth of texts."""
         response = await self.client.post(
             "/embeddings",
             json={
@@ -71,6 +120,55 @@ class OpenRouterService:
         embeddings_data = sorted(data["data"], key=lambda x: x["index"])
         return [item["embedding"] for item in embeddings_data]
 
+    async def create_embeddings_batch(
+        self,
+        texts: list[str],
+        chunk_size: int = 96,
+        max_concurrent: int = 4,
+    ) -> list[list[float]]:
+        """
+        Create embeddings for multiple texts.
+        With an embedding_cache, only texts not embedded before with this
+        model are sent. Texts are sent in chunks of chunk_size (keeping each
+        request within provider batch limits), up to max_concurrent chunks
+        in flight at once.
+        """
+        if self.embedding_cache is None:
+            return await self._embed_uncached(texts, chunk_size, max_concurrent)
+
+        hashes = [_content_hash(text) for text in texts]
+        cached = self.embedding_cache.get_cached_embeddings(self.embedding_model, hashes)
+
+        # Embed each distinct missing text once
+        missing = {h: text for h, text in zip(hashes, texts) if h not in cached}
+        if missing:
+            fresh = await self._embed_uncached(list(missing.values()), chunk_size, max_concurrent)
+            new_items = list(zip(missing.keys(), fresh))
+            self.embedding_cache.cache_embeddings(self.embedding_model, new_items)
+            cached.update(new_items)
+
+        return [cached[h] for h in hashes]
+
+    async def _embed_uncached(
+        self, texts: list[str], chunk_size: int, max_concurrent: int
+    ) -> list[list[float]]:
+        """Embed texts via the API in chunked, concurrent requests."""
+        if len(texts) <= chunk_size:
+            return await self._post_embeddings(texts) if texts else []
+
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def send(chunk: list[str]) -> list[list[float]]:
+            async with semaphore:
+                return await self._post_embeddings(chunk)
+
+        # gather() returns results in submission order
+        results = await asyncio.gather(*[
+            send(texts[i:i + chunk_size])
+            for i in range(0, len(texts), chunk_size)
+        ])
+        return [embedding for chunk in results for embedding in chunk]
+
     async def chat(
         self,
         messages: list[dict],
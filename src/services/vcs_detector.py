@@ -1,10 +1,23 @@
 """Version Control System detector utility."""
 
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from enum import Enum
 from typing import Optional
 
+# url of [remote "origin"] in .git/config, and default of [paths] in .hg/hgrc;
+# [^\[]* keeps the match inside the section
+_GIT_ORIGIN_URL_RE = re.compile(
+    rb'^\s*\[remote "origin"\][^\[]*?^\s*url\s*=\s*(.+?)\s*$', re.MULTILINE
+)
+_HG_DEFAULT_PATH_RE = re.compile(
+    rb"^\s*\[paths\][^\[]*?^\s*default\s*=\s*(.+?)\s*$", re.MULTILINE
+)
+
 
 class VCSType(Enum):
     """Supported version control systems."""
@@ -20,7 +33,20 @@ class VCSInfo:
     vcs_type: VCSType
     root_path: Path
     name: str
-    remote_url: Optional[str] = None
+
+    @cached_property
+    def remote_url(self) -> Optional[str]:
+        """Remote URL, read from the VCS config on first access."""
+        reader = _REMOTE_READERS.get(self.vcs_type)
+        return reader(self.root_path) if reader else None
+
+
+def _detect_vcs_type(path: str) -> Optional[VCSType]:
+    """Return the VCS whose metadata directory exists in path, if any."""
+    for marker, vcs_type in _VCS_MARKERS:
+        if os.path.exists(os.path.join(path, marker)):
+            return vcs_type
+    return None
 
 
 def detect_vcs(path: Path) -> Optional[VCSInfo]:
@@ -36,61 +62,20 @@ def detect_vcs(path: Path) -> Optional[VCSInfo]:
     if not path.is_dir():
         return None
 
-    # Check for Git
-    git_dir = path / ".git"
-    if git_dir.exists():
-        remote_url = _get_git_remote(path)
-        return VCSInfo(
-            vcs_type=VCSType.GIT,
-            root_path=path,
-            name=path.name,
-            remote_url=remote_url,
-        )
-
-    # Check for Subversion
-    svn_dir = path / ".svn"
-    if svn_dir.exists():
-        return VCSInfo(
-            vcs_type=VCSType.SUBVERSION,
-            root_path=path,
-            name=path.name,
-            remote_url=_get_svn_remote(path),
-        )
-
-    # Check for Mercurial
-    hg_dir = path / ".hg"
-    if hg_dir.exists():
-        return VCSInfo(
-            vcs_type=VCSType.MERCURIAL,
-            root_path=path,
-            name=path.name,
-            remote_url=_get_hg_remote(path),
-        )
-
-    return None
+    vcs_type = _detect_vcs_type(str(path))
+    if vcs_type is None:
+        return None
+    return VCSInfo(vcs_type=vcs_type, root_path=path, name=path.name)
 
 
 def _get_git_remote(path: Path) -> Optional[str]:
     """Get the remote URL from a Git repository."""
     try:
-        config_file = path / ".git" / "config"
-        if not config_file.exists():
-            return None
-
-        content = config_file.read_text()
-        # Simple parsing for origin remote URL
-        in_origin = False
-        for line in content.splitlines():
-            line = line.strip()
-            if line == '[remote "origin"]':
-                in_origin = True
-            elif line.startswith("["):
-                in_origin = False
-            elif in_origin and line.startswith("url = "):
-                return line[6:].strip()
-    except (IOError, UnicodeDecodeError):
-        pass
-    return None
+        data = (path / ".git" / "config").read_bytes()
+    except OSError:
+        return None
+    match = _GIT_ORIGIN_URL_RE.search(data)
+    return match.group(1).strip().decode("utf-8", errors="replace") if match else None
 
 
 def _get_svn_remote(path: Path) -> Optional[str]:
@@ -113,23 +98,36 @@ def _get_svn_remote(path: Path) -> Optional[str]:
 def _get_hg_remote(path: Path) -> Optional[str]:
     """Get the default remote URL from a Mercurial repository."""
     try:
-        hgrc_file = path / ".hg" / "hgrc"
-        if not hgrc_file.exists():
-            return None
+        data = (path / ".hg" / "hgrc").read_bytes()
+    except OSError:
+        return None
+    match = _HG_DEFAULT_PATH_RE.search(data)
+    return match.group(1).strip().decode("utf-8", errors="replace") if match else None
 
-        content = hgrc_file.read_text()
-        in_paths = False
-        for line in content.splitlines():
-            line = line.strip()
-            if line == "[paths]":
-                in_paths = True
-            elif line.startswith("["):
-                in_paths = False
-            elif in_paths and line.startswith("default = "):
-                return line[10:].strip()
-    except (IOError, UnicodeDecodeError):
-        pass
-    return None
+
+# Metadata directory for each VCS, in detection order
+_VCS_MARKERS = (
+    (".git", VCSType.GIT),
+    (".svn", VCSType.SUBVERSION),
+    (".hg", VCSType.MERCURIAL),
+)
+
+# README filenames, most preferred first
+_README_PRIORITY = {
+    name: rank
+    for rank, name in enumerate(
+        ("README.md", "README.MD", "readme.md", "README.rst", "README.txt", "README")
+    )
+}
+
+# Upper bound on threads used to walk top-level subdirectories
+_SCAN_WORKERS = 16
+
+_REMOTE_READERS = {
+    VCSType.GIT: _get_git_remote,
+    VCSType.SUBVERSION: _get_svn_remote,
+    VCSType.MERCURIAL: _get_hg_remote,
+}
 
 
 def scan_directory_for_repos(
@@ -157,15 +155,45 @@ def scan_directory_for_repos(
         repos.append(vcs_info)
         return repos  # Don't scan inside a repo
 
-    # Scan subdirectories
+    # Scan subdirectories; each top-level subtree is walked on its own
+    # thread so stat latency (network mounts, spinning disks) overlaps
     if max_depth > 0:
-        try:
-            for subdir in base_path.iterdir():
-                if subdir.is_dir() and not subdir.name.startswith("."):
-                    repos.extend(scan_directory_for_repos(subdir, max_depth - 1))
-        except PermissionError:
-            pass
+        subdirs = _list_subdirs(str(base_path))
+        if len(subdirs) > 1:
+            with ThreadPoolExecutor(max_workers=min(_SCAN_WORKERS, len(subdirs))) as executor:
+                # map() keeps the directory listing order
+                for found in executor.map(lambda e: _scan_entry(e, max_depth), subdirs):
+                    repos.extend(found)
+        else:
+            for entry in subdirs:
+                repos.extend(_scan_entry(entry, max_depth))
+
+    return repos
+
+
+def _list_subdirs(dir_path: str) -> list[os.DirEntry]:
+    """
+    Non-hidden subdirectories of dir_path. os.scandir lets the directory
+    check reuse the entry type from the listing.
+    """
+    try:
+        with os.scandir(dir_path) as entries:
+            return [e for e in entries if not e.name.startswith(".") and e.is_dir()]
+    except OSError:
+        return []
+
 
+def _scan_entry(entry: os.DirEntry, depth: int) -> list[VCSInfo]:
+    """Repositories at or below a subdirectory entry, descending depth - 1 more levels."""
+    vcs_type = _detect_vcs_type(entry.path)
+    if vcs_type is not None:
+        # Don't scan inside a repo
+        return [VCSInfo(vcs_type=vcs_type, root_path=Path(entry.path), name=entry.name)]
+
+    repos = []
+    if depth > 1:
+        for child in _list_subdirs(entry.path):
+            repos.extend(_scan_entry(child, depth - 1))
     return repos
 
 
@@ -179,24 +207,27 @@ def get_readme_from_repo(repo_path: Path) -> Optional[str]:
     Returns:
         README content if found, None otherwise
     """
-    readme_names = [
-        "README.md",
-        "README.MD",
-        "readme.md",
-        "README.rst",
-        "README.txt",
-        "README",
-    ]
-
-    for name in readme_names:
-        readme_path = repo_path / name
-        if readme_path.exists():
-            try:
-                return readme_path.read_text(encoding="utf-8")
-            except (IOError, UnicodeDecodeError):
-                continue
+    # One directory listing; keep the most preferred README name seen
+    best_path = None
+    best_rank = len(_README_PRIORITY)
+    try:
+        with os.scandir(repo_path) as entries:
+            for entry in entries:
+                rank = _README_PRIORITY.get(entry.name)
+                if rank is not None and rank < best_rank:
+                    best_rank = rank
+                    best_path = entry.path
+    except OSError:
+        return None
 
-    return None
+    if best_path is None:
+        return None
+
+    try:
+        with open(best_path, "rb") as f:
+            return f.read().decode("utf-8", errors="replace")
+    except OSError:
+        return None
 
 
 def get_description_from_repo(repo_path: Path) -> Optional[str]:
@@ -232,3 +263,34 @@ def get_description_from_repo(repo_path: Path) -> Optional[str]:
                 return line[:200] if len(line) > 200 else line
 
     return None
+
+
+@lru_cache(maxsize=2048)
+def _description_cached(path_str: str, source_mtimes: tuple) -> Optional[str]:
+    """get_description_from_repo() memoized by path and the mtimes of its source files."""
+    return get_description_from_repo(Path(path_str))
+
+
+def get_description_from_repo_cached(repo_path: Path) -> Optional[str]:
+    """
+    Like get_description_from_repo(), but reuses the result from an earlier
+    sync while .git/description and the README files are unchanged (same
+    names and mtimes).
+    """
+    try:
+        desc_mtime = os.stat(repo_path / ".git" / "description").st_mtime_ns
+    except OSError:
+        desc_mtime = None
+    readme_mtimes = []
+    try:
+        with os.scandir(repo_path) as entries:
+            for entry in entries:
+                if entry.name in _README_PRIORITY:
+                    try:
+                        readme_mtimes.append((entry.name, entry.stat().st_mtime_ns))
+                    except OSError:
+                        continue
+    except OSError:
+        return None
+    readme_mtimes.sort()
+    return _description_cached(str(repo_path), (desc_mtime, tuple(readme_mtimes)))
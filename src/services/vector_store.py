@@ -1,93 +1,462 @@
 """Vector store service using ChromaDB."""
 
+import asyncio
+import hashlib
+import heapq
+import threading
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
+from typing import Literal, Optional
 
 import chromadb
+import numpy as np
 from chromadb.config import Settings
 
 from ..models.repository import Repository
 
+try:
+    import simsimd
+except ImportError:  # Optional: SIMD cosine kernels for rerank()
+    simsimd = None
+
+
+# Chroma 0.6+ takes NumPy embedding matrices as-is; older releases want lists
+_CHROMA_TAKES_ARRAYS = tuple(int(p) for p in chromadb.__version__.split(".")[:2]) >= (0, 6)
+
+
+def _as_embeddings(embeddings: list[list[float]] | np.ndarray) -> list[list[float]] | np.ndarray:
+    """Embeddings in the form this chromadb accepts, without boxing floats when it can."""
+    if _CHROMA_TAKES_ARRAYS:
+        return np.asarray(embeddings, dtype=np.float32)
+    if isinstance(embeddings, np.ndarray):
+        return embeddings.tolist()
+    return [e.tolist() if isinstance(e, np.ndarray) else e for e in embeddings]
+
+
+def _merge_query_results(partials: list[dict], n_results: int, include: tuple[str, ...]) -> dict:
+    """Merge single-query results from several collections into the n_results nearest."""
+    rows = [
+        (distance, p, i)
+        for p, partial in enumerate(partials)
+        for i, distance in enumerate(partial["distances"][0])
+    ]
+    nearest = heapq.nsmallest(n_results, rows)
+    merged = {"ids": [[partials[p]["ids"][0][i] for _, p, i in nearest]]}
+    for field in include:
+        merged[field] = [[partials[p][field][0][i] for _, p, i in nearest]]
+    return merged
+
+
+def _collection_space(collection) -> str:
+    """The distance space a collection's HNSW index was built with."""
+    configuration = getattr(collection, "configuration", None) or {}
+    hnsw = configuration.get("hnsw") if isinstance(configuration, dict) else None
+    if hnsw and hnsw.get("space"):
+        return hnsw["space"]
+    return (collection.metadata or {}).get("hnsw:space", "l2")
+
+
+def _similarities(results: dict, count: int) -> list[float]:
+    """
+    Cosine similarities (1 - distance) for the first query in a result set,
+    computed in one array operation; 1.0 each when distances were not returned.
+    """
+    if not results["distances"]:
+        return [1.0] * count
+    return (1.0 - np.asarray(results["distances"][0], dtype=np.float64)).tolist()
+
 
 class VectorStore:
     """ChromaDB-based vector store for repository embeddings."""
 
     COLLECTION_NAME = "repositories"
-
-    def __init__(self, persist_directory: str | Path):
+    # Repos per collection.upsert() call; large calls are split into these
+    UPSERT_BATCH_SIZE = 166
+    # HNSW index settings, applied when the collection is created. Scores are
+    # computed as 1 - distance, which assumes the cosine space.
+    COLLECTION_METADATA = {
+        "description": "GitHub repository embeddings",
+        "hnsw:space": "cosine",
+        "hnsw:M": 16,
+        "hnsw:construction_ef": 64,
+        "hnsw:search_ef": 40,
+    }
+    # Raw query results kept for repeated searches, most recent last
+    QUERY_CACHE_SIZE = 128
+    # Metadata of recently fetched repositories kept by get_repository()
+    REPO_CACHE_SIZE = 1024
+    # Rows per collection.get() page when reading the whole store
+    GET_PAGE_SIZE = 10_000
+
+    def __init__(
+        self,
+        persist_directory: str | Path,
+        mode: Literal["persistent", "http"] = "persistent",
+        host: str = "localhost",
+        port: int = 8000,
+        shards: int = 1,
+    ):
+        """
+        mode "persistent" keeps the store in persist_directory; "http"
+        connects to a Chroma server at host:port instead. The caches here
+        assume this instance is the collection's only writer.
+
+        shards > 1 spreads repositories over that many collections by a hash
+        of full_name; batch upserts and queries then run per shard in
+        parallel and query results are merged. Changing it on an existing
+        store requires a rebuild.
+        """
         self.persist_directory = Path(persist_directory)
-        self.persist_directory.mkdir(parents=True, exist_ok=True)
-
-        self.client = chromadb.PersistentClient(
-            path=str(self.persist_directory),
-            settings=Settings(anonymized_telemetry=False),
-        )
-
-        self.collection = self.client.get_or_create_collection(
-            name=self.COLLECTION_NAME,
-            metadata={"description": "GitHub repository embeddings"},
-        )
+        settings = Settings(anonymized_telemetry=False)
+
+        if mode == "http":
+            self.client = chromadb.HttpClient(host=host, port=port, settings=settings)
+        else:
+            self.persist_directory.mkdir(parents=True, exist_ok=True)
+            self.client = chromadb.PersistentClient(
+                path=str(self.persist_directory),
+                settings=settings,
+            )
+
+        self.shards = max(1, shards)
+        # Set when a collection was rebuilt on open because its index used
+        # another space; its embeddings are gone and must be regenerated
+        self.recreated = False
+        self._collections = self._open_collections()
+        self._executor = ThreadPoolExecutor(max_workers=self.shards) if self.shards > 1 else None
+        # Per-shard collection.count() and recent query results, cached until the next write
+        self._counts: Optional[list[int]] = None
+        self._query_cache: OrderedDict[tuple, dict] = OrderedDict()
+        self._repo_cache: OrderedDict[str, dict] = OrderedDict()
+        # (ids, float32 matrix) of every stored embedding, loaded by rerank()
+        self._embedding_matrix: Optional[tuple[list[str], np.ndarray]] = None
+        # Every id in the collection, loaded on first use and kept in step
+        # with writes, so deletes of unknown ids skip Chroma entirely.
+        # Replaced rather than mutated, so readers can hold on to it
+        self._ids: Optional[frozenset[str]] = None
+        # Searches and updates run on different threads: the caches above are
+        # only touched under this lock, and a value computed before a write
+        # finished (its generation is stale) is not stored
+        self._cache_lock = threading.Lock()
+        self._generation = 0
+
+        # Load the HNSW index in the background so the first search is fast
+        threading.Thread(target=self._warm_index, daemon=True).start()
+
+    def _open_collections(self) -> list:
+        """
+        Get or create the store's collection, or one per shard. The space of
+        an existing index can't be changed, so a collection built with
+        another one (older stores used L2) is dropped and recreated.
+        """
+        if self.shards == 1:
+            names = [self.COLLECTION_NAME]
+        else:
+            names = [f"{self.COLLECTION_NAME}_{i}" for i in range(self.shards)]
+        space = self.COLLECTION_METADATA["hnsw:space"]
+        collections = []
+        for name in names:
+            collection = self.client.get_or_create_collection(name=name, metadata=self.COLLECTION_METADATA)
+            if _collection_space(collection) != space:
+                self.client.delete_collection(name)
+                collection = self.client.create_collection(name=name, metadata=self.COLLECTION_METADATA)
+                self.recreated = True
+            collections.append(collection)
+        return collections
+
+    def _warm_index(self):
+        """Run a throwaway query per collection so Chroma loads its index now."""
+        for collection in list(self._collections):
+            try:
+                # A stored vector as the probe; a zero vector has no cosine
+                results = collection.get(limit=1, include=["embeddings"])
+                embeddings = results["embeddings"]
+                if embeddings is None or not len(embeddings):
+                    continue
+                collection.query(
+                    query_embeddings=_as_embeddings(np.asarray(embeddings[:1], dtype=np.float32)),
+                    n_results=1,
+                    include=[],
+                )
+            except Exception:
+                pass
+
+    def _shard_of(self, full_name: str) -> int:
+        """Index of the collection (shard) that holds full_name."""
+        if self.shards == 1:
+            return 0
+        return zlib.crc32(full_name.encode("utf-8")) % self.shards
+
+    def _collection_for(self, full_name: str):
+        """The collection (shard) that holds full_name."""
+        return self._collections[self._shard_of(full_name)]
+
+    def _map_shards(self, func, *iterables) -> list:
+        """Apply func across shards, in parallel when sharded."""
+        if self._executor is None:
+            return list(map(func, *iterables))
+        return list(self._executor.map(func, *iterables))
+
+    def _shard_counts(self) -> list[int]:
+        """collection.count() of each shard, cached until the next write."""
+        with self._cache_lock:
+            counts, generation = self._counts, self._generation
+        if counts is None:
+            counts = [collection.count() for collection in self._collections]
+            with self._cache_lock:
+                if self._generation == generation:
+                    self._counts = counts
+        return counts
+
+    def _invalidate_caches(
+        self,
+        added: Optional[list[str]] = None,
+        removed: Optional[list[str]] = None,
+        ids: Optional[frozenset[str]] = None,
+    ):
+        """
+        Drop cached counts and query results after the collection changes,
+        and bring the id set in step (added/removed ids, or a replacement).
+        Called once the write is done, so nothing cached during it survives.
+        """
+        with self._cache_lock:
+            self._generation += 1
+            self._counts = None
+            self._query_cache.clear()
+            self._repo_cache.clear()
+            self._embedding_matrix = None
+            if ids is not None:
+                self._ids = ids
+            elif self._ids is not None:
+                if added:
+                    self._ids = self._ids.union(added)
+                if removed:
+                    self._ids = self._ids.difference(removed)
+
+    def _known_ids(self) -> frozenset[str]:
+        """The set of ids stored in the collection."""
+        with self._cache_lock:
+            ids, generation = self._ids, self._generation
+        if ids is None:
+            loaded = set()
+            for collection in self._collections:
+                loaded.update(collection.get(include=[])["ids"])
+            ids = frozenset(loaded)
+            with self._cache_lock:
+                if self._generation == generation:
+                    self._ids = ids
+        return ids
+
+    def get_embedding_matrix(self) -> tuple[list[str], np.ndarray]:
+        """
+        All stored embeddings as (ids, contiguous float32 matrix), row-aligned.
+        Loaded once and kept until the next write.
+        """
+        with self._cache_lock:
+            cached, generation = self._embedding_matrix, self._generation
+        if cached is None:
+            ids = []
+            blocks = []
+            for collection in self._collections:
+                results = collection.get(include=["embeddings"])
+                embeddings = results["embeddings"]
+                if embeddings is not None and len(embeddings):
+                    ids.extend(results["ids"])
+                    blocks.append(np.asarray(embeddings, dtype=np.float32))
+            matrix = np.ascontiguousarray(
+                np.concatenate(blocks) if blocks else np.empty((0, 0)),
+                dtype=np.float32,
+            )
+            cached = (ids, matrix)
+            with self._cache_lock:
+                if self._generation == generation:
+                    self._embedding_matrix = cached
+        return cached
+
+    def rerank(
+        self,
+        query_embedding: list[float] | np.ndarray,
+        embeddings: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        Cosine similarity of query_embedding to each row of embeddings
+        (default: the whole store, in get_embedding_matrix() order).
+        Uses simsimd when installed, NumPy otherwise.
+        """
+        if embeddings is None:
+            embeddings = self.get_embedding_matrix()[1]
+        matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if matrix.size == 0:
+            return np.empty(0, dtype=np.float32)
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(1, -1)
+
+        if simsimd is not None:
+            distances = np.asarray(simsimd.cdist(query, matrix, metric="cosine"))
+            return 1.0 - distances.ravel()
+
+        norms = np.linalg.norm(matrix, axis=1) * np.linalg.norm(query)
+        norms[norms == 0] = 1.0
+        return (matrix @ query.ravel()) / norms
+
+    def _query_collection(
+        self,
+        query_embedding: list[float] | np.ndarray,
+        n_results: int,
+        where: Optional[dict],
+        include: tuple[str, ...],
+    ) -> dict:
+        """collection.query() for a single embedding, served from the LRU cache when possible."""
+        query = np.asarray(query_embedding, dtype=np.float32)
+        digest = hashlib.blake2b(query.tobytes(), digest_size=16).digest()
+        key = (digest, n_results, repr(where), include)
+        with self._cache_lock:
+            generation = self._generation
+            results = self._query_cache.get(key)
+            if results is not None:
+                self._query_cache.move_to_end(key)
+                return results
+
+        query_embeddings = _as_embeddings(query.reshape(1, -1))
+        if self.shards == 1:
+            results = self._collections[0].query(
+                query_embeddings=query_embeddings,
+                n_results=n_results,
+                where=where,
+                include=list(include),
+            )
+        else:
+            # Ask every non-empty shard for its own top n_results, keep the best overall
+            active = [
+                (collection, min(n_results, count))
+                for collection, count in zip(self._collections, self._shard_counts())
+                if count
+            ]
+            partials = self._map_shards(
+                lambda shard: shard[0].query(
+                    query_embeddings=query_embeddings,
+                    n_results=shard[1],
+                    where=where,
+                    include=list(include),
+                ),
+                active,
+            )
+            results = _merge_query_results(partials, n_results, include)
+        with self._cache_lock:
+            if self._generation == generation:
+                self._query_cache[key] = results
+                if len(self._query_cache) > self.QUERY_CACHE_SIZE:
+                    self._query_cache.popitem(last=False)
+        return results
 
     def upsert_repository(
         self,
         repo: Repository,
-        embedding: list[float],
+        embedding: list[float] | np.ndarray,
     ):
         """Add or update a repository in the vector store."""
-        self.collection.upsert(
-            ids=[repo.full_name],
-            embeddings=[embedding],
-            metadatas=[repo.to_metadata()],
-            documents=[repo.to_embedding_text()],
-        )
+        try:
+            self._collection_for(repo.full_name).upsert(
+                ids=[repo.full_name],
+                embeddings=_as_embeddings([embedding]),
+                metadatas=[repo.to_metadata()],
+                documents=[repo.to_embedding_text()],
+            )
+        finally:
+            self._invalidate_caches(added=[repo.full_name])
 
     def upsert_repositories_batch(
         self,
         repos: list[Repository],
-        embeddings: list[list[float]],
+        embeddings: list[list[float]] | np.ndarray,
     ):
-        """Add or update multiple repositories."""
+        """Add or update multiple repositories, UPSERT_BATCH_SIZE per call."""
         if not repos:
             return
 
-        self.collection.upsert(
-            ids=[r.full_name for r in repos],
-            embeddings=embeddings,
-            metadatas=[r.to_metadata() for r in repos],
-            documents=[r.to_embedding_text() for r in repos],
-        )
+        step = self.UPSERT_BATCH_SIZE
+
+        def upsert_shard(collection, shard_repos, shard_embeddings):
+            # Columns are built per sub-batch, so only one sub-batch of
+            # metadata and text is alive at a time
+            for start in range(0, len(shard_repos), step):
+                end = start + step
+                columns = Repository.embedding_columns(shard_repos[start:end])
+                collection.upsert(
+                    ids=columns["ids"],
+                    embeddings=_as_embeddings(shard_embeddings[start:end]),
+                    metadatas=columns["metadatas"],
+                    documents=columns["texts"],
+                )
+
+        try:
+            if self.shards == 1:
+                upsert_shard(self._collections[0], repos, embeddings)
+            else:
+                groups: dict[int, list[int]] = {}
+                for i, repo in enumerate(repos):
+                    groups.setdefault(self._shard_of(repo.full_name), []).append(i)
+                collections = [self._collections[shard] for shard in groups]
+                shard_repos = [[repos[i] for i in idx] for idx in groups.values()]
+                if isinstance(embeddings, np.ndarray):
+                    shard_embeddings = [embeddings[idx] for idx in groups.values()]
+                else:
+                    shard_embeddings = [[embeddings[i] for i in idx] for idx in groups.values()]
+                self._map_shards(upsert_shard, collections, shard_repos, shard_embeddings)
+        finally:
+            # A failed batch may be partly written; ids it didn't store are
+            # harmless in the set (deletes of them are a no-op in Chroma)
+            self._invalidate_caches(added=[repo.full_name for repo in repos])
+
+    async def upsert_repositories_batch_async(
+        self,
+        repos: list[Repository],
+        embeddings: list[list[float]] | np.ndarray,
+    ):
+        """
+        upsert_repositories_batch() on a worker thread, so an event loop can
+        keep computing embeddings while the write is in flight.
+        """
+        await asyncio.to_thread(self.upsert_repositories_batch, repos, embeddings)
 
     def query(
         self,
-        query_embedding: list[float],
+        query_embedding: list[float] | np.ndarray,
         n_results: int = 5,
         where: Optional[dict] = None,
-    ) -> list[tuple[Repository, float]]:
-        """Query for similar repositories."""
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_results,
-            where=where,
-            include=["metadatas", "distances", "documents"],
+        lightweight: bool = False,
+    ) -> list[tuple[Repository, float]] | list[tuple[str, float]]:
+        """
+        Query for similar repositories.
+        With lightweight=True, returns (full_name, score) pairs and skips
+        fetching and parsing metadata.
+        """
+        if lightweight:
+            results = self._query_collection(query_embedding, n_results, where, ("distances",))
+            if results["ids"] and results["ids"][0]:
+                ids = results["ids"][0]
+                return list(zip(ids, _similarities(results, len(ids))))
+            return []
+
+        results = self._query_collection(
+            query_embedding, n_results, where, ("metadatas", "distances")
         )
 
         repos_with_scores = []
 
         if results["metadatas"] and results["metadatas"][0]:
             metadatas = results["metadatas"][0]
-            distances = results["distances"][0] if results["distances"] else [0] * len(metadatas)
+            similarities = _similarities(results, len(metadatas))
 
-            for metadata, distance in zip(metadatas, distances):
-                repo = Repository.from_metadata(metadata)
-                # Convert distance to similarity score (1 - distance for cosine)
-                similarity = 1 - distance
-                repos_with_scores.append((repo, similarity))
+            for metadata, similarity in zip(metadatas, similarities):
+                repos_with_scores.append((Repository.from_metadata(metadata), similarity))
 
         return repos_with_scores
 
     def get_semantic_scores(
         self,
-        query_embedding: list[float],
+        query_embedding: list[float] | np.ndarray,
         max_results: int = 100,
     ) -> dict[str, float]:
         """
@@ -96,63 +465,106 @@ class VectorStore:
         Returns a dict mapping full_name -> similarity_score (0-1).
         Used for hybrid search to combine with keyword matching.
         """
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=min(max_results, self.count()),
-            include=["distances"],
-        )
-
-        scores = {}
-
-        if results["ids"] and results["ids"][0]:
-            ids = results["ids"][0]
-            distances = results["distances"][0] if results["distances"] else [0] * len(ids)
+        n_results = min(max_results, self.count())
+        if n_results <= 0:
+            return {}
 
-            for full_name, distance in zip(ids, distances):
-                # Convert distance to similarity score (1 - distance for cosine)
-                scores[full_name] = 1 - distance
-
-        return scores
+        # Only distances are requested, so they are always present
+        results = self._query_collection(query_embedding, n_results, None, ("distances",))
+        distances = np.asarray(results["distances"][0], dtype=np.float64)
+        return dict(zip(results["ids"][0], (1.0 - distances).tolist()))
 
     def get_all_repositories(self) -> list[Repository]:
-        """Get all repositories from the vector store."""
-        results = self.collection.get(include=["metadatas"])
-
+        """Get all repositories from the vector store, read in pages of GET_PAGE_SIZE."""
         repos = []
-        if results["metadatas"]:
-            for metadata in results["metadatas"]:
-                repos.append(Repository.from_metadata(metadata))
-
+        for collection in self._collections:
+            offset = 0
+            while True:
+                results = collection.get(
+                    include=["metadatas"], limit=self.GET_PAGE_SIZE, offset=offset
+                )
+                metadatas = results["metadatas"] or ()
+                repos.extend(map(Repository.from_metadata, metadatas))
+                if len(metadatas) < self.GET_PAGE_SIZE:
+                    break
+                offset += self.GET_PAGE_SIZE
         return repos
 
     def get_repository(self, full_name: str) -> Optional[Repository]:
         """Get a specific repository by full name."""
-        results = self.collection.get(
+        # Unknown ids are answered from the id set, recent hits from the LRU
+        if full_name not in self._known_ids():
+            return None
+
+        with self._cache_lock:
+            generation = self._generation
+            metadata = self._repo_cache.get(full_name)
+            if metadata is not None:
+                self._repo_cache.move_to_end(full_name)
+        if metadata is not None:
+            return Repository.from_metadata(metadata)
+
+        results = self._collection_for(full_name).get(
             ids=[full_name],
             include=["metadatas"],
         )
 
         if results["metadatas"] and results["metadatas"][0]:
-            return Repository.from_metadata(results["metadatas"][0])
+            metadata = results["metadatas"][0]
+            with self._cache_lock:
+                if self._generation == generation:
+                    self._repo_cache[full_name] = metadata
+                    if len(self._repo_cache) > self.REPO_CACHE_SIZE:
+                        self._repo_cache.popitem(last=False)
+            return Repository.from_metadata(metadata)
 
         return None
 
     def delete_repository(self, full_name: str):
         """Delete a repository from the vector store."""
+        self.delete_repositories([full_name])
+
+    def delete_repositories(self, full_names: list[str]):
+        """Delete several repositories from the vector store in one call; unknown ids are ignored."""
+        known = self._known_ids()
+        full_names = [name for name in full_names if name in known]
+        if not full_names:
+            return
+        by_shard: dict[int, list[str]] = {}
+        for name in full_names:
+            by_shard.setdefault(self._shard_of(name), []).append(name)
         try:
-            self.collection.delete(ids=[full_name])
-        except Exception:
-            pass
+            for shard, names in by_shard.items():
+                self._collections[shard].delete(ids=names)
+        finally:
+            self._invalidate_caches(removed=full_names)
 
     def count(self) -> int:
         """Get the number of repositories in the store."""
-        return self.collection.count()
-
-    def clear(self):
-        """Clear all repositories from the store."""
-        # Delete and recreate collection
-        self.client.delete_collection(self.COLLECTION_NAME)
-        self.collection = self.client.get_or_create_collection(
-            name=self.COLLECTION_NAME,
-            metadata={"description": "GitHub repository embeddings"},
-        )
+        return sum(self._shard_counts())
+
+    def clear(self, recreate: bool = False):
+        """
+        Clear all repositories from the store.
+        Deletes the stored ids and keeps the collections and their settings;
+        recreate=True drops and recreates them instead (e.g. to apply new
+        COLLECTION_METADATA).
+        """
+        if not recreate:
+            try:
+                for collection in self._collections:
+                    ids = collection.get(include=[])["ids"]
+                    for start in range(0, len(ids), self.GET_PAGE_SIZE):
+                        collection.delete(ids=ids[start:start + self.GET_PAGE_SIZE])
+                self._invalidate_caches(ids=frozenset())
+                return
+            except Exception:
+                pass  # Fall back to recreating the collections
+
+        # Delete and recreate the collection(s)
+        try:
+            for collection in self._collections:
+                self.client.delete_collection(collection.name)
+            self._collections = self._open_collections()
+        finally:
+            self._invalidate_caches(ids=frozenset())
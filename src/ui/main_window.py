@@ -5,7 +5,7 @@ import subprocess
 import webbrowser
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 
 def _format_relative_time(dt: datetime) -> str:
@@ -37,63 +37,79 @@ from PyQt6.QtWidgets import (
     QApplication,
     QFrame,
 )
-from PyQt6.QtCore import Qt, QThread, QTimer, pyqtSignal, pyqtSlot
+from PyQt6.QtCore import (
+    Qt, QObject, QRunnable, QThread, QThreadPool, QTimer, QFileSystemWatcher, pyqtSignal, pyqtSlot,
+)
 from PyQt6.QtGui import QAction, QIcon, QColor
 
 from .styles import MAIN_STYLESHEET
 from .repo_list import RepositoryListWidget
 from .settings_dialog import SettingsDialog
 from .progress_dialog import ProgressDialog
-from ..config import ConfigManager
+from ..config import Config, ConfigManager, GITHUB_PATH_FIELDS, HF_PATH_FIELDS
 from ..models.repository import Repository
 from ..services.database import Database
 from ..services.github_service import GitHubService
+from ..services.huggingface_service import HuggingFaceService, LocalRepoService
 from ..services.openrouter_service import OpenRouterService
 from ..services.vector_store import VectorStore
 
+# Repository sources synced at the same time during an update
+SYNC_CONCURRENCY = 4
+
+# Repository sources whose READMEs are read from disk.
+LOCAL_SOURCES = frozenset(("work", "forks", "docs", "local"))
+
+# Repositories per embedding request; READMEs are fetched a batch at a time
+EMBED_BATCH_SIZE = 50
+
 
-class ApiHealthCheckWorker(QThread):
-    """Worker thread for checking API connection health."""
+def _new_hf_service(config: Config) -> HuggingFaceService:
+    """HuggingFaceService for the token and path slots in config."""
+    return HuggingFaceService(
+        config.hf_token,
+        datasets_path=config.hf_datasets_path,
+        datasets_path_2=config.hf_datasets_path_2,
+        models_path=config.hf_models_path,
+        models_path_2=config.hf_models_path_2,
+        spaces_path=config.hf_spaces_path,
+        spaces_path_2=config.hf_spaces_path_2,
+    )
 
-    # Signals: (service_name, is_connected, message)
+
+class HealthCheckSignals(QObject):
+    """Results of HealthCheck runnables; owned by the window that shows them."""
+
+    # Signals: (is_connected, message)
     github_status = pyqtSignal(bool, str)
     huggingface_status = pyqtSignal(bool, str)
 
-    def __init__(self, config: "Config"):
+
+class HealthCheck(QRunnable):
+    """Checks one API connection on the global thread pool."""
+
+    def __init__(self, make_service: Callable[[], object], status):
         super().__init__()
-        self.config = config
+        self.make_service = make_service
+        self.status = status  # Bound HealthCheckSignals signal to report on
 
     def run(self):
-        """Check API connections."""
-        # Check GitHub
-        if self.config.github_pat:
-            try:
-                from ..services.github_service import GitHubService
-                service = GitHubService(self.config.github_pat, self.config.repos_base_path or "")
-                success, message = service.test_connection()
-                self.github_status.emit(success, message)
-            except Exception as e:
-                self.github_status.emit(False, str(e))
-        else:
-            self.github_status.emit(False, "Not configured")
-
-        # Check Hugging Face
-        if self.config.hf_token:
-            try:
-                from ..services.huggingface_service import HuggingFaceService
-                service = HuggingFaceService(self.config.hf_token)
-                success, message = service.test_connection()
-                self.huggingface_status.emit(success, message)
-            except Exception as e:
-                self.huggingface_status.emit(False, str(e))
-        else:
-            self.huggingface_status.emit(False, "Not configured")
+        """Check the service connection."""
+        try:
+            success, message = self.make_service().test_connection()
+        except Exception as e:
+            success, message = False, str(e)
+        try:
+            self.status.emit(success, message)
+        except RuntimeError:
+            pass  # The window (and its signals holder) is already gone
 
 
 class UpdateReposWorker(QThread):
     """Worker thread for updating repositories and embeddings from multiple sources."""
 
     progress = pyqtSignal(str, int, int)  # message, current, total
+    warning = pyqtSignal(str)  # non-fatal problem to show the user
     stage_changed = pyqtSignal(int)  # stage number (1-indexed)
     all_stages_complete = pyqtSignal()
     finished = pyqtSignal(list, int, int)  # repos, total_synced, changed_count
@@ -111,20 +127,160 @@ class UpdateReposWorker(QThread):
         self.openrouter = openrouter_service
         self.vector_store = vector_store
         self.database = database
+        # Services created during one run and reused across its stages
+        self._github: Optional[GitHubService] = None
+        self._hf: Optional[HuggingFaceService] = None
+        # HF card descriptions per (type, owner), listed once per run
+        self._card_descriptions: Optional[dict[tuple[str, str], dict[str, str]]] = None
 
     def run(self):
         """Execute the update pipeline."""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                repos, total, changed = loop.run_until_complete(self._update_repos())
-                self.finished.emit(repos, total, changed)
-            finally:
-                loop.close()
+            repos, total, changed = asyncio.run(self._run_update())
+            self.finished.emit(repos, total, changed)
         except Exception as e:
             self.error.emit(str(e))
 
+    def _github_service(self) -> GitHubService:
+        """This run's GitHubService, resolving checkouts under every GitHub path."""
+        if self._github is None:
+            paths = [getattr(self.config, f) or "" for f in GITHUB_PATH_FIELDS]
+            self._github = GitHubService(self.config.github_pat, paths[0], paths[1:])
+        return self._github
+
+    def _hf_service(self) -> HuggingFaceService:
+        """This run's HuggingFaceService."""
+        if self._hf is None:
+            self._hf = _new_hf_service(self.config)
+        return self._hf
+
+    def _sync_sources(self) -> list[tuple[str, str, Callable]]:
+        """
+        Every configured repository source, as (start message, error label,
+        sync function taking (database, progress_callback)).
+        """
+        sources = []
+
+        # GitHub - the account is listed once and matched against all GitHub paths
+        if self.config.github_pat and any(getattr(self.config, f) for f in GITHUB_PATH_FIELDS):
+            github_service = self._github_service()
+            sources.append((
+                "Syncing repositories from GitHub...",
+                "GitHub sync",
+                github_service.sync_repos_to_database,
+            ))
+
+        # Hugging Face - one service covers all path slots
+        if self.config.hf_token and any(getattr(self.config, f) for f in HF_PATH_FIELDS):
+            hf_service = self._hf_service()
+            sources.append((
+                "Syncing repositories from Hugging Face...",
+                "Hugging Face sync",
+                hf_service.sync_repos_to_database,
+            ))
+
+        # Local repo scans (work, forks, docs)
+        local_sources = [
+            (self.config.work_repos_path, "work", "work repositories"),
+            (self.config.forks_path, "forks", "forked repositories"),
+            (self.config.docs_path, "docs", "documentation repositories"),
+        ]
+        for path, source_name, display_name in local_sources:
+            if path:
+                local_service = LocalRepoService(path, source_name=source_name)
+                sources.append((
+                    f"Scanning {display_name}...",
+                    f"{display_name.capitalize()} scan",
+                    local_service.sync_repos_to_database,
+                ))
+
+        return sources
+
+    async def _fetch_readmes(self, repos: list[Repository]) -> dict[str, str]:
+        """Fetch READMEs for repos from their sources, all backends at once."""
+        # Group repos by source for efficient fetching (single pass)
+        github_repos: list[Repository] = []
+        hf_repos: list[Repository] = []
+        local_repos: list[Repository] = []
+        for repo in repos:
+            source = repo.source
+            if source == "github":
+                github_repos.append(repo)
+            elif source == "huggingface":
+                hf_repos.append(repo)
+            elif source in LOCAL_SOURCES:
+                local_repos.append(repo)
+
+        async def fetch_github() -> dict[str, str]:
+            if not (github_repos and self.config.github_pat):
+                return {}
+            github_service = self._github_service()
+            return await asyncio.to_thread(github_service.fetch_readmes_parallel, github_repos)
+
+        async def fetch_huggingface() -> dict[str, str]:
+            if not (hf_repos and self.config.hf_token):
+                return {}
+            hf_service = self._hf_service()
+            return await hf_service.fetch_readmes_async(
+                hf_repos, card_descriptions=self._card_descriptions
+            )
+
+        async def fetch_local() -> dict[str, str]:
+            if not local_repos:
+                return {}
+            local_service = LocalRepoService("", source_name="local")
+            return await asyncio.to_thread(local_service.fetch_readmes_parallel, local_repos)
+
+        # One failing backend doesn't discard what the others fetched
+        readmes: dict[str, str] = {}
+        fetches = (("GitHub", fetch_github()), ("HF", fetch_huggingface()), ("Local", fetch_local()))
+        results = await asyncio.gather(*(coro for _, coro in fetches), return_exceptions=True)
+        for (label, _), fetched in zip(fetches, results):
+            if isinstance(fetched, Exception):
+                self.warning.emit(f"{label} README fetch error: {fetched}")
+            else:
+                readmes.update(fetched)
+        return readmes
+
+    async def _stream_batches(
+        self,
+        repos: list[Repository],
+        queue: asyncio.Queue,
+        batch_size: int,
+    ) -> None:
+        """Fetch READMEs one batch at a time and queue each batch for embedding.
+
+        Puts None on the queue when done, even if a fetch fails; not when
+        cancelled, since the consumer has stopped reading by then.
+        """
+        cancelled = False
+        try:
+            # List HF card descriptions for all repos up front; per batch,
+            # the same owners' listings would be fetched again and again
+            hf_repos = [repo for repo in repos if repo.source == "huggingface"]
+            if hf_repos and self.config.hf_token:
+                self._card_descriptions = await self._hf_service().list_card_descriptions(hf_repos)
+
+            for i in range(0, len(repos), batch_size):
+                batch = repos[i:i + batch_size]
+                readmes = await self._fetch_readmes(batch)
+
+                # Update database with fetched READMEs (one executemany, single commit)
+                readme_rows = []
+                for repo in batch:
+                    if repo.full_name in readmes:
+                        repo.readme_content = readmes[repo.full_name]
+                        readme_rows.append((repo.readme_content, repo.readme_etag, repo.full_name))
+                self.database.update_readme_many(readme_rows)
+
+                await queue.put(batch)
+        except asyncio.CancelledError:
+            cancelled = True
+            raise
+        finally:
+            if not cancelled:
+                await queue.put(None)
+
     async def _update_repos(self) -> tuple[list[Repository], int, int]:
         """Update repositories with incremental sync from all sources."""
         total_repos = 0
@@ -133,83 +289,30 @@ class UpdateReposWorker(QThread):
         def progress_cb(msg, current, total):
             self.progress.emit(msg, current, total)
 
-        # Stage 1: Sync from all configured sources
+        # Stage 1: Sync from all configured sources. Each sync blocks on
+        # network or disk, so they run on worker threads and overlap, a few
+        # at a time to stay clear of API rate limits.
         self.stage_changed.emit(1)
+        semaphore = asyncio.Semaphore(SYNC_CONCURRENCY)
 
-        # 1a: GitHub - sync from all configured GitHub paths
-        github_paths = [
-            (self.config.repos_base_path, "github"),
-            (self.config.github_public_path, "github"),
-            (self.config.github_private_path, "github"),
-        ]
-        for path, source in github_paths:
-            if self.config.github_pat and path:
-                self.progress.emit(f"Syncing repositories from GitHub ({path})...", 0, 0)
-                try:
-                    github_service = GitHubService(
-                        self.config.github_pat,
-                        path,
-                    )
-                    gh_total, gh_changed = github_service.sync_repos_to_database(
-                        self.database, progress_cb
-                    )
-                    total_repos += gh_total
-                    changed_repos += gh_changed
-                except Exception as e:
-                    self.progress.emit(f"GitHub sync error: {e}", 0, 0)
-
-        # 1b: Hugging Face - check all path slots
-        if self.config.hf_token and (
-            self.config.hf_datasets_path or self.config.hf_datasets_path_2 or
-            self.config.hf_models_path or self.config.hf_models_path_2 or
-            self.config.hf_spaces_path or self.config.hf_spaces_path_2
-        ):
-            self.progress.emit("Syncing repositories from Hugging Face...", 0, 0)
-            try:
-                from ..services.huggingface_service import HuggingFaceService
-
-                hf_service = HuggingFaceService(
-                    self.config.hf_token,
-                    datasets_path=self.config.hf_datasets_path,
-                    datasets_path_2=self.config.hf_datasets_path_2,
-                    models_path=self.config.hf_models_path,
-                    models_path_2=self.config.hf_models_path_2,
-                    spaces_path=self.config.hf_spaces_path,
-                    spaces_path_2=self.config.hf_spaces_path_2,
-                )
-                hf_total, hf_changed = hf_service.sync_repos_to_database(
-                    self.database, progress_cb
-                )
-                total_repos += hf_total
-                changed_repos += hf_changed
-            except ImportError:
-                self.progress.emit("Hugging Face: huggingface_hub not installed", 0, 0)
-            except Exception as e:
-                self.progress.emit(f"Hugging Face sync error: {e}", 0, 0)
-
-        # 1c: Local repo scans (work, forks, docs)
-        local_sources = [
-            (self.config.work_repos_path, "work", "work repositories"),
-            (self.config.forks_path, "forks", "forked repositories"),
-            (self.config.docs_path, "docs", "documentation repositories"),
-        ]
-        for path, source_name, display_name in local_sources:
-            if path:
-                self.progress.emit(f"Scanning {display_name}...", 0, 0)
-                try:
-                    from ..services.huggingface_service import LocalRepoService
+        async def run_one(message: str, sync) -> tuple[int, int]:
+            async with semaphore:
+                self.progress.emit(message, 0, 0)
+                return await asyncio.to_thread(sync, self.database, progress_cb)
 
-                    local_service = LocalRepoService(
-                        path,
-                        source_name=source_name
-                    )
-                    local_total, local_changed = local_service.sync_repos_to_database(
-                        self.database, progress_cb
-                    )
-                    total_repos += local_total
-                    changed_repos += local_changed
-                except Exception as e:
-                    self.progress.emit(f"{display_name.capitalize()} scan error: {e}", 0, 0)
+        sources = self._sync_sources()
+        results = await asyncio.gather(
+            *(run_one(message, sync) for message, _, sync in sources),
+            return_exceptions=True,
+        )
+        for (_, label, _), result in zip(sources, results):
+            if isinstance(result, ImportError):
+                self.warning.emit(f"{label} error: missing dependency ({result})")
+            elif isinstance(result, Exception):
+                self.warning.emit(f"{label} error: {result}")
+            else:
+                total_repos += result[0]
+                changed_repos += result[1]
 
         # Stage 2: Get repos that need embedding and fetch READMEs
         repos_to_embed = self.database.get_repos_needing_embedding()
@@ -220,96 +323,50 @@ class UpdateReposWorker(QThread):
         if embed_count > 0:
             self.progress.emit(f"Fetching READMEs for {embed_count} repositories...", 0, embed_count)
 
-            # Fetch READMEs based on source
-            readmes = {}
-
-            # Group repos by source for efficient fetching
-            github_repos = [r for r in repos_to_embed if r.source == "github"]
-            hf_repos = [r for r in repos_to_embed if r.source == "huggingface"]
-            local_repos = [r for r in repos_to_embed if r.source in ("work", "forks", "docs", "local")]
-
-            # Fetch GitHub READMEs
-            if github_repos and self.config.github_pat:
-                def readme_progress(msg, current, total):
-                    self.progress.emit(msg, current, total)
-
-                try:
-                    github_service = GitHubService(
-                        self.config.github_pat,
-                        self.config.repos_base_path,
-                    )
-                    gh_readmes = github_service.fetch_readmes_parallel(
-                        github_repos, readme_progress, max_workers=8
-                    )
-                    readmes.update(gh_readmes)
-                except Exception:
-                    pass
-
-            # Fetch HF READMEs
-            if hf_repos and self.config.hf_token:
-                try:
-                    from ..services.huggingface_service import HuggingFaceService
-
-                    hf_service = HuggingFaceService(
-                        self.config.hf_token,
-                        datasets_path=self.config.hf_datasets_path,
-                        datasets_path_2=self.config.hf_datasets_path_2,
-                        models_path=self.config.hf_models_path,
-                        models_path_2=self.config.hf_models_path_2,
-                        spaces_path=self.config.hf_spaces_path,
-                        spaces_path_2=self.config.hf_spaces_path_2,
-                    )
-                    hf_readmes = hf_service.fetch_readmes_parallel(
-                        hf_repos, readme_progress, max_workers=8
-                    )
-                    readmes.update(hf_readmes)
-                except Exception:
-                    pass
-
-            # Fetch local READMEs
-            if local_repos:
-                try:
-                    from ..services.huggingface_service import LocalRepoService
-
-                    local_service = LocalRepoService("", source_name="local")
-                    local_readmes = local_service.fetch_readmes_parallel(
-                        local_repos, readme_progress, max_workers=8
-                    )
-                    readmes.update(local_readmes)
-                except Exception:
-                    pass
-
-            # Update database with fetched READMEs
-            for repo in repos_to_embed:
-                if repo.full_name in readmes:
-                    repo.readme_content = readmes[repo.full_name]
-                    self.database.update_readme(repo.full_name, repo.readme_content)
-
-            # Stage 3: Generate embeddings in batches
-            self.stage_changed.emit(3)
-            self.progress.emit("Generating embeddings...", 0, embed_count)
-
-            batch_size = 10
-            for i in range(0, embed_count, batch_size):
-                batch = repos_to_embed[i:i + batch_size]
-                texts = [r.to_embedding_text() for r in batch]
-
-                try:
-                    embeddings = await self.openrouter.create_embeddings_batch(texts)
-
-                    # Store in vector store
-                    self.vector_store.upsert_repositories_batch(batch, embeddings)
-
-                    # Mark as embedded in database
-                    self.database.mark_embedded_batch([r.full_name for r in batch])
+            # Stage 3 runs as the consumer of stage 2: READMEs for the next
+            # batch are fetched while the current one is being embedded, with
+            # at most two batches buffered in between.
+            queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+            producer = asyncio.create_task(
+                self._stream_batches(repos_to_embed, queue, EMBED_BATCH_SIZE)
+            )
 
-                    self.progress.emit(
-                        f"Embedded {min(i + batch_size, embed_count)}/{embed_count} repositories",
-                        min(i + batch_size, embed_count),
-                        embed_count,
-                    )
-                except Exception as e:
-                    self.progress.emit(f"Warning: Failed to embed batch: {e}", i, embed_count)
+            embedded = 0
+            try:
+                while (batch := await queue.get()) is not None:
+                    if embedded == 0:
+                        self.stage_changed.emit(3)
+                        self.progress.emit("Generating embeddings...", 0, embed_count)
+
+                    texts = [r.to_embedding_text() for r in batch]
+                    try:
+                        embeddings = await self.openrouter.create_embeddings_batch(texts)
+
+                        # Store in vector store (on a worker thread, so the
+                        # producer keeps fetching READMEs meanwhile)
+                        await self.vector_store.upsert_repositories_batch_async(batch, embeddings)
+
+                        # Mark as embedded in database
+                        self.database.mark_embedded_batch([r.full_name for r in batch])
+
+                        self.progress.emit(
+                            f"Embedded {embedded + len(batch)}/{embed_count} repositories",
+                            embedded + len(batch),
+                            embed_count,
+                        )
+                    except Exception as e:
+                        self.warning.emit(f"Failed to embed batch: {e}")
+                    embedded += len(batch)
+
+                await producer
+            finally:
+                # Don't leave the producer running if the consumer bailed out
+                if not producer.done():
+                    producer.cancel()
+                    try:
+                        await producer
+                    except asyncio.CancelledError:
+                        pass
         else:
             # No repos to embed, still go through stage 3 briefly
             self.stage_changed.emit(3)
@@ -318,12 +375,25 @@ class UpdateReposWorker(QThread):
         # All stages complete
         self.all_stages_complete.emit()
 
-        await self.openrouter.close()
-
         # Return all repos from database
         all_repos = self.database.get_all_repositories()
         return all_repos, total_repos, changed_repos
 
+    async def _run_update(self) -> tuple[list[Repository], int, int]:
+        """
+        Run _update_repos(), closing this loop's OpenRouter client and
+        dropping this run's services however it ends.
+        """
+        try:
+            return await self._update_repos()
+        finally:
+            if self._github is not None:
+                self._github.close()
+                self._github = None
+            self._hf = None
+            self._card_descriptions = None
+            await self.openrouter.close()
+
 
 class MainWindow(QMainWindow):
     """Main application window."""
@@ -336,16 +406,31 @@ class MainWindow(QMainWindow):
         self.database: Optional[Database] = None
         self.github_service: Optional[GitHubService] = None
         self.openrouter_service: Optional[OpenRouterService] = None
+        self._openrouter_settings: Optional[tuple[str, str, str]] = None
         self.vector_store: Optional[VectorStore] = None
 
         self.current_worker: Optional[UpdateReposWorker] = None
-        self.health_check_worker: Optional[ApiHealthCheckWorker] = None
+        # Set when settings change mid-update; applied once the worker is done
+        self._settings_reload_pending = False
+        self.health_signals = HealthCheckSignals(self)
+        self.health_signals.github_status.connect(self._on_github_health)
+        self.health_signals.huggingface_status.connect(self._on_hf_health)
         self.progress_dialog: Optional[ProgressDialog] = None
         self.repositories: list[Repository] = []
 
+        # Worker progress is coalesced and applied to widgets at most every
+        # 50 ms, so per-repo ticks don't flood the event queue
+        self._pending_progress: Optional[tuple[str, int, int]] = None
+        # Warnings of the current update, shown as they come and summarized at the end
+        self._update_warnings: list[str] = []
+        self._progress_flush_timer = QTimer(self)
+        self._progress_flush_timer.setInterval(50)
+        self._progress_flush_timer.timeout.connect(self._flush_progress)
+
         self._setup_ui()
         self._setup_services()
         self._restore_geometry()
+        self._setup_settings_watcher()
 
         # Check for first-run experience
         self._check_first_run()
@@ -524,15 +609,26 @@ class MainWindow(QMainWindow):
                     self.config.repos_base_path,
                 )
 
-            self.openrouter_service = OpenRouterService(
+            # Keep the existing OpenRouter service unless its settings changed
+            openrouter_settings = (
                 self.config.openrouter_key,
                 self.config.embedding_model,
                 self.config.chat_model,
             )
+            if self.openrouter_service is None or self._openrouter_settings != openrouter_settings:
+                self.openrouter_service = OpenRouterService(
+                    *openrouter_settings, embedding_cache=self.database
+                )
+                self._openrouter_settings = openrouter_settings
+            else:
+                self.openrouter_service.embedding_cache = self.database
 
             self.vector_store = VectorStore(
                 self.config.data_dir / "chromadb"
             )
+            if self.vector_store.recreated:
+                # The old index used another distance space; embed everything again
+                self.database.clear_all_embeddings()
 
             # Set services on repo list for semantic search
             self.repo_list.set_services(self.openrouter_service, self.vector_store)
@@ -567,15 +663,72 @@ class MainWindow(QMainWindow):
             if "width" in geo and "height" in geo:
                 self.resize(geo["width"], geo["height"])
 
-    def _check_api_health(self):
-        """Run API health checks in background."""
-        if self.health_check_worker and self.health_check_worker.isRunning():
+    def _setup_settings_watcher(self):
+        """Watch settings.json so external edits apply without a restart."""
+        self._settings_reload_timer = QTimer(self)
+        self._settings_reload_timer.setSingleShot(True)
+        self._settings_reload_timer.setInterval(100)  # Debounce bursts of events
+        self._settings_reload_timer.timeout.connect(self._reload_settings)
+
+        # Watch the directory too: atomic saves replace the file, which
+        # drops it from the watcher
+        self.settings_watcher = QFileSystemWatcher(self)
+        self.settings_watcher.addPath(str(self.config.config_dir))
+        settings_file = self.config.config_dir / "settings.json"
+        if settings_file.exists():
+            self.settings_watcher.addPath(str(settings_file))
+        self.settings_watcher.fileChanged.connect(self._on_settings_path_changed)
+        self.settings_watcher.directoryChanged.connect(self._on_settings_path_changed)
+
+    @pyqtSlot(str)
+    def _on_settings_path_changed(self, path: str):
+        """Schedule a settings reload when the watched file or directory changes."""
+        self._settings_reload_timer.start()
+
+    def _reload_settings(self):
+        """Reload settings after an external change to settings.json."""
+        settings_file = self.config.config_dir / "settings.json"
+        if str(settings_file) not in self.settings_watcher.files() and settings_file.exists():
+            self.settings_watcher.addPath(str(settings_file))
+
+        # Our own saves leave the mtime cache in sync, so they are a no-op here
+        if not self.config_manager.reload():
+            return
+
+        # The running worker holds the current services; rebuild them once it's done
+        if self.current_worker and self.current_worker.isRunning():
+            self._settings_reload_pending = True
+            return
+
+        self._setup_services()
+        self._check_api_health()
+
+    def _apply_pending_settings(self):
+        """Rebuild services for a settings change deferred during an update."""
+        if not self._settings_reload_pending:
             return
+        self._settings_reload_pending = False
+        self._setup_services()
+        self._check_api_health()
 
-        self.health_check_worker = ApiHealthCheckWorker(self.config)
-        self.health_check_worker.github_status.connect(self._on_github_health)
-        self.health_check_worker.huggingface_status.connect(self._on_hf_health)
-        self.health_check_worker.start()
+    def _check_api_health(self):
+        """Run API health checks in background, all services at once."""
+        config = self.config
+        pool = QThreadPool.globalInstance()
+        if config.github_pat:
+            pool.start(HealthCheck(
+                lambda: GitHubService(config.github_pat, config.repos_base_path or ""),
+                self.health_signals.github_status,
+            ))
+        else:
+            self._on_github_health(False, "Not configured")
+        if config.hf_token:
+            pool.start(HealthCheck(
+                lambda: _new_hf_service(config),
+                self.health_signals.huggingface_status,
+            ))
+        else:
+            self._on_hf_health(False, "Not configured")
 
     @pyqtSlot(bool, str)
     def _on_github_health(self, connected: bool, message: str):
@@ -618,7 +771,7 @@ class MainWindow(QMainWindow):
             "width": self.width(),
             "height": self.height(),
         }
-        self.config_manager.update(window_geometry=geo)
+        self.config_manager.update_state(window_geometry=geo)
 
         # Check if we're really quitting (from tray menu)
         if getattr(self, '_really_quit', False):
@@ -683,19 +836,18 @@ class MainWindow(QMainWindow):
         # Create and start worker with config for multi-source sync
         self.current_worker = UpdateReposWorker(
             self.config,
-            OpenRouterService(
-                self.config.openrouter_key,
-                self.config.embedding_model,
-                self.config.chat_model,
-            ),
+            self.openrouter_service,
             self.vector_store,
             self.database,
         )
         self.current_worker.progress.connect(self._on_update_progress)
+        self.current_worker.warning.connect(self._on_update_warning)
         self.current_worker.stage_changed.connect(self._on_stage_changed)
         self.current_worker.all_stages_complete.connect(self._on_all_stages_complete)
         self.current_worker.finished.connect(self._on_update_finished)
         self.current_worker.error.connect(self._on_update_error)
+        self._update_warnings = []
+        self._progress_flush_timer.start()
         self.current_worker.start()
 
         # Show dialog (non-blocking due to worker thread)
@@ -703,7 +855,30 @@ class MainWindow(QMainWindow):
 
     @pyqtSlot(str, int, int)
     def _on_update_progress(self, message: str, current: int, total: int):
-        """Handle update progress."""
+        """
+        Handle update progress. Per-item ticks are coalesced and applied by
+        _flush_progress; phase messages (nothing counted yet) show at once.
+        """
+        self._pending_progress = (message, current, total)
+        if total <= 0 or current <= 0:
+            self._flush_progress()
+
+    @pyqtSlot(str)
+    def _on_update_warning(self, message: str):
+        """Show an update warning at once and keep it for the final summary."""
+        self._flush_progress()
+        self._update_warnings.append(message)
+        self.status_label.setText(f"Warning: {message}")
+        if self.progress_dialog:
+            self.progress_dialog.show_warning(message)
+
+    def _flush_progress(self):
+        """Apply the latest pending progress update to the widgets."""
+        if self._pending_progress is None:
+            return
+        message, current, total = self._pending_progress
+        self._pending_progress = None
+
         self.status_label.setText(message)
         if total > 0:
             self.progress_bar.setRange(0, total)
@@ -730,14 +905,22 @@ class MainWindow(QMainWindow):
     @pyqtSlot(list, int, int)
     def _on_update_finished(self, repos: list[Repository], total: int, changed: int):
         """Handle update completion."""
+        self._flush_progress()
+        self._progress_flush_timer.stop()
         self.repositories = repos
         self.repo_list.set_repositories(repos)
         if changed > 0:
-            self.status_label.setText(f"Synced {total} repositories ({changed} updated)")
+            status = f"Synced {total} repositories ({changed} updated)"
         else:
-            self.status_label.setText(f"Synced {total} repositories (no changes)")
+            status = f"Synced {total} repositories (no changes)"
+        if self._update_warnings:
+            count = len(self._update_warnings)
+            status += f" - {count} warning{'s' if count != 1 else ''}"
+        self.status_label.setText(status)
+        self.status_label.setToolTip("\n".join(self._update_warnings))
         self.progress_bar.setVisible(False)
         self.update_action.setEnabled(True)
+        self._apply_pending_settings()
 
         # Close progress dialog after a brief delay to show completion
         if self.progress_dialog:
@@ -746,9 +929,12 @@ class MainWindow(QMainWindow):
     @pyqtSlot(str)
     def _on_update_error(self, error: str):
         """Handle update error."""
+        self._progress_flush_timer.stop()
+        self._pending_progress = None
         self.status_label.setText(f"Error: {error}")
         self.progress_bar.setVisible(False)
         self.update_action.setEnabled(True)
+        self._apply_pending_settings()
 
         # Close progress dialog
         if self.progress_dialog:
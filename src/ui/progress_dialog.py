@@ -131,6 +131,10 @@ class ProgressDialog(QDialog):
             self.progress_bar.setMaximum(0)  # Indeterminate
             self.detail_label.setText("")
 
+    def show_warning(self, message: str):
+        """Show a non-fatal problem without touching the progress bar."""
+        self.status_label.setText(f"Warning: {message}")
+
     def set_phase(self, phase: str):
         """Set the current phase label."""
         self.setWindowTitle(f"Syncing Repositories - {phase}")
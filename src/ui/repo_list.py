@@ -74,8 +74,11 @@ class SemanticSearchWorker(QThread):
 
     async def _search(self) -> dict[str, float]:
         """Run the embedding and vector search."""
-        # Create embedding for query
-        query_embedding = await self.openrouter.create_embedding(self.query_text)
+        # Create embedding for query; the client belongs to this thread's loop
+        try:
+            query_embedding = await self.openrouter.create_embedding(self.query_text)
+        finally:
+            await self.openrouter.close()
         # Get semantic scores for all repos
         scores = self.vector_store.get_semantic_scores(query_embedding, max_results=500)
         return scores
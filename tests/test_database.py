@@ -0,0 +1,53 @@
+"""Tests for the SQLite repository database."""
+
+import gc
+import threading
+from datetime import datetime, timezone
+
+from src.services.database import Database
+
+
+def test_thread_connections_close_when_threads_exit(tmp_path):
+    db = Database(tmp_path / "repos.db")
+    db.get_repo_count()
+
+    for _ in range(5):
+        thread = threading.Thread(target=db.get_repo_count)
+        thread.start()
+        thread.join()
+    gc.collect()
+
+    # Only the main thread's connection is left open
+    assert len(db._conns) == 1
+    db.close()
+    assert db._conns == []
+
+
+def _github_args(pushed_day: int) -> dict:
+    when = datetime(2024, 1, pushed_day, tzinfo=timezone.utc)
+    return dict(
+        full_name="octo/repo", name="repo", description=None,
+        created_at=when, updated_at=when, pushed_at=when, is_private=False,
+        html_url="https://github.com/octo/repo", clone_url="", default_branch="main", topics=[],
+    )
+
+
+def _github_row(pushed_day: int) -> tuple:
+    when = datetime(2024, 1, pushed_day, tzinfo=timezone.utc).isoformat()
+    return ("octo/repo", "repo", None, when, when, when, 0,
+            "https://github.com/octo/repo", "", "main", "", None)
+
+
+def test_upsert_from_github_reports_new_or_changed(tmp_path):
+    db = Database(tmp_path / "repos.db")
+
+    assert db.upsert_from_github(**_github_args(1)) is True
+    # Unchanged but still waiting for its embedding: not a change
+    assert db.upsert_from_github(**_github_args(1)) is False
+    assert db.upsert_from_github_many([_github_row(1)]) == [False]
+    assert len(db.get_repos_needing_embedding()) == 1
+
+    assert db.upsert_from_github(**_github_args(2)) is True
+    db.mark_embedded("octo/repo")
+    assert db.upsert_from_github_many([_github_row(2)]) == [False]
+    assert db.upsert_from_github_many([_github_row(3)]) == [True]
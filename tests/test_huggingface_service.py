@@ -0,0 +1,65 @@
+"""Tests for the Hugging Face sync service."""
+
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import create_autospec
+
+from huggingface_hub import HfApi
+
+from src.services.database import Database
+from src.services.huggingface_service import HuggingFaceService
+
+
+def _when(day: int) -> datetime:
+    return datetime(2024, 1, day, tzinfo=timezone.utc)
+
+
+def _model(repo_id: str, day: int) -> SimpleNamespace:
+    return SimpleNamespace(id=repo_id, tags=["nlp"], private=False, last_modified=_when(day))
+
+
+def _service(tmp_path) -> tuple[HuggingFaceService, HfApi]:
+    # Spec'd against the installed HfApi, so unsupported keywords raise TypeError
+    api = create_autospec(HfApi, instance=True)
+    api.whoami.return_value = {"name": "alice"}
+    service = HuggingFaceService("token", models_path=str(tmp_path))
+    service._api = api
+    return service, api
+
+
+def test_incremental_sync_stops_at_cursor(tmp_path):
+    service, api = _service(tmp_path)
+    api.list_models.return_value = [_model("alice/new", 3), _model("alice/old", 1)]
+    db = Database(tmp_path / "repos.db")
+    db.set_last_hf_sync("model", _when(2))
+
+    assert service.sync_repos_to_database(db) == (1, 1)
+    api.list_models.assert_called_once_with(author="alice", sort="last_modified")
+    assert db.get_repository("hf:model:alice/new") is not None
+    assert db.get_repository("hf:model:alice/old") is None
+    assert db.get_last_hf_sync("model") == _when(3)
+
+
+def test_listing_error_is_reported_and_keeps_cursor(tmp_path):
+    service, api = _service(tmp_path)
+    api.list_models.side_effect = ConnectionError("503 Service Unavailable")
+    db = Database(tmp_path / "repos.db")
+    db.set_last_hf_sync("model", _when(2))
+    messages = []
+
+    assert service.sync_repos_to_database(db, lambda msg, *_: messages.append(msg)) == (0, 0)
+    assert any("503" in msg for msg in messages)
+    assert db.get_last_hf_sync("model") == _when(2)
+
+
+def test_sync_refreshes_local_path_of_unlisted_repo(tmp_path):
+    service, api = _service(tmp_path)
+    api.list_models.return_value = [_model("alice/old", 1)]
+    db = Database(tmp_path / "repos.db")
+    service.sync_repos_to_database(db)
+    assert not db.get_repository("hf:model:alice/old").local_path
+
+    # Cloned after the first sync; the listing now stops before reaching it
+    (tmp_path / "old" / ".git").mkdir(parents=True)
+    assert service.sync_repos_to_database(db) == (0, 0)
+    assert db.get_repository("hf:model:alice/old").local_path == str(tmp_path / "old")